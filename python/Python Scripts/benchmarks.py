@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd  # type: ignore
+from bs4 import BeautifulSoup
+
+import html_parser
+import parse_pool
+import rolling_stats
+from game_log_schema import build_frame, extract
+
+# data-stats read for every row of a basic WR game log
+wr_stats = [
+    'game_date', 'week_num', 'age', 'team', 'game_location', 'opp', 'game_result', 'gs', 'rush_att', 'rush_yds',
+    'rush_yds_per_att', 'rush_td', 'targets', 'rec', 'rec_yds', 'rec_td', 'rec_yds_per_rec', 'catch_pct',
+    'rec_yds_per_tgt', 'fumbles_lost', 'offense', 'off_pct',
+]
+
+
+# helper function that times a function over a number of runs and returns the mean, in milliseconds
+def time_it(function, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+# helper function that reads every stat the way the builders used to: one soup.find per cell, twice when checked
+def find_per_cell(soup: BeautifulSoup):
+    for row in soup.find('tbody').find_all('tr'):
+        for stat in wr_stats:
+            if row.find('td', {'data-stat': stat}):
+                row.find('td', {'data-stat': stat}).text
+
+
+# helper function that reads every stat with the single-pass row parser
+def single_pass(soup: BeautifulSoup):
+    for row in soup.find('tbody').find_all('tr'):
+        cells = html_parser.row_cells(row)
+        for stat in wr_stats:
+            cells.get(stat, '')
+
+
+def bench_row_parsing(html: str, runs: int = 50):
+    """A function to compare per-page parse time of per-cell soup.find lookups against the single-pass row parser.
+
+    Args:
+        html (str): A saved basic game log page
+        runs (int): The number of times each parser is run
+
+    """
+
+    soup = BeautifulSoup(html, 'html.parser')
+    before = time_it(lambda: find_per_cell(soup), runs)
+    after = time_it(lambda: single_pass(soup), runs)
+    print('per-cell find:   %.2f ms/page' % before)
+    print('single pass:     %.2f ms/page (%.1fx)' % (after, before / after))
+    rows = html_parser.table_rows(html, backend='html.parser')
+    print('extract:         %.2f ms/page' % time_it(lambda: extract(rows, 'WR', 'basic'), runs))
+
+
+def bench_parsers(html: str, runs: int = 50):
+    """A function to compare the parser backends on a saved page, and check they all read the same rows.
+
+    Args:
+        html (str): A saved game log page
+        runs (int): The number of times each backend is run
+
+    """
+
+    print('whole page, html.parser:  %.2f ms/page' % time_it(lambda: extract(
+        [html_parser.row_cells(row) for row in html_parser.get_soup(html, backend='html.parser').find('tbody').find_all('tr')],
+        'WR', 'basic'
+    ), runs))
+    for backend in html_parser.backends:
+        if html_parser.is_available(backend):
+            print('table only, %-12s  %.2f ms/page' % (backend + ':', time_it(
+                lambda: extract(html_parser.table_rows(html, backend=backend), 'WR', 'basic'), runs
+            )))
+    print('parity with html.parser:', html_parser.check_parity(html))
+
+
+def bench_parse_workers(html: str, pages: int = 200, worker_counts: list = None):
+    """A function to measure how many pages per second the parse stage gets through with each number of parser processes.
+
+    Every page is sent to the pool as raw bytes and comes back as column arrays, the way the scrapers use it.
+
+    Args:
+        html (str): A saved basic game log page
+        pages (int): The number of pages parsed for each worker count
+        worker_counts (list): The numbers of parser processes to try (default = 0, 1, 2, 4 and every core)
+
+    """
+
+    page = html.encode('utf-8')
+    worker_counts = worker_counts or sorted({0, 1, 2, 4, os.cpu_count() or 1})
+    for workers in worker_counts:
+        pool = parse_pool.ParsePool(workers)
+        if workers:
+            # start the processes (and their imports) before timing
+            for future in [pool.submit(page, 'WR', 'basic') for _ in range(workers)]:
+                future.result()
+        start = time.perf_counter()
+        if workers:
+            for future in [pool.submit(page, 'WR', 'basic') for _ in range(pages)]:
+                build_frame(future.result())
+        else:
+            for _ in range(pages):
+                pool.parse(page, 'WR', 'basic')
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        print('%2d parser processes: %7.1f pages/s' % (workers, pages / elapsed))
+
+
+# helper function that makes up game logs: every player plays every week of every season
+def fake_games(players: int, seasons: int, weeks: int = 17) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = players * seasons * weeks
+    return pd.DataFrame({
+        'name': np.repeat(['player ' + str(i) for i in range(players)], seasons * weeks),
+        'year': np.tile(np.repeat(np.arange(2024 - seasons, 2024), weeks), players),
+        'week': np.tile(np.arange(1, weeks + 1), players * seasons),
+        'tgt': rng.integers(0, 15, n),
+        'snap_pct': rng.uniform(0, 100, n).round(1),
+        'air_yds': rng.integers(-5, 150, n),
+        'yac': rng.integers(0, 80, n),
+    })
+
+
+def bench_rolling(players: int = 500, seasons: int = 8, runs: int = 5):
+    """A function to compare updating the rolling stats for a new week against recomputing every player's history.
+
+    The incremental update recomputes the new week from the stored games its windows reach back to (the rest of the
+    season and the 7 games before), the way rolling_stats.update reads them; both must give the same new rows.
+
+    Args:
+        players (int): The number of players
+        seasons (int): The number of seasons of history each player has
+        runs (int): The number of times each update is run
+
+    """
+
+    history = fake_games(players, seasons)
+    new = (history['year'] == history['year'].max()) & (history['week'] == history['week'].max())
+    stored = history[~new]
+    # what rolling_stats.update reads back from the store: the season so far and the 7 games before the new week
+    season = stored['year'] == history['year'].max()
+    context = pd.concat([stored[season], stored.groupby('name').tail(max(rolling_stats.windows) - 1)]).drop_duplicates()
+    changed = pd.concat([context, history[new]], ignore_index=True)
+
+    full = time_it(lambda: rolling_stats.compute(history), runs)
+    incremental = time_it(lambda: rolling_stats.compute(changed), runs)
+    expected = rolling_stats.compute(history)
+    expected = expected[new.to_numpy()].reset_index(drop=True)
+    actual = rolling_stats.compute(changed)
+    actual = actual[actual['week'] == history['week'].max()].reset_index(drop=True)
+    averages = [column for column in expected.columns if column.endswith(('_std', '_avg3', '_avg5', '_avg8'))]
+
+    print('%d players, %d games' % (players, len(history)))
+    print('full recompute:      %8.1f ms' % full)
+    print('incremental update:  %8.1f ms (%.1fx, %d games read)' % (
+        incremental, full / incremental, len(changed)))
+    print('same new rows:', np.allclose(expected[averages].astype('float64'), actual[averages].astype('float64')))
+
+
+def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == 'rolling':
+        bench_rolling()
+        return
+    if len(sys.argv) < 3:
+        print('usage: python benchmarks.py parse|parsers|workers <saved game log .html>  or  python benchmarks.py rolling')
+        return
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        html = f.read()
+    if sys.argv[1] == 'parse':
+        bench_row_parsing(html)
+    elif sys.argv[1] == 'parsers':
+        bench_parsers(html)
+    elif sys.argv[1] == 'workers':
+        bench_parse_workers(html)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd  # type: ignore
+from psycopg2 import sql
+
+default_batch_size = int(os.environ.get('FF_LOAD_BATCH_SIZE', 50))  # players per transaction
+# a batch is also loaded early once it holds this many rows or bytes of frames in memory
+default_max_rows = int(os.environ.get('FF_LOAD_MAX_ROWS', 20000))
+default_max_bytes = int(os.environ.get('FF_LOAD_MAX_BYTES', 64 * 1024 * 1024))
+
+# a player's game is one row of a game log table
+upsert_key = ['name', 'year', 'date']
+
+# the version of every table loaded through this module, bumped in the load's transaction, so readers (e.g.
+# split_engine's cache) see the table change exactly when the load is committed
+create_versions_table = """
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name text PRIMARY KEY,
+    version bigint NOT NULL,
+    updated_at timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+bump_version = """
+INSERT INTO data_versions (table_name, version) VALUES (%s, 1)
+ON CONFLICT (table_name) DO UPDATE SET version = data_versions.version + 1, updated_at = now()
+"""
+
+
+# helper function that streams a DataFrame into a table with COPY FROM STDIN (CSV)
+def copy_frame(cursor, df: pd.DataFrame, table: str):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep='\\N')
+    buffer.seek(0)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')").format(
+        sql.Identifier(table),
+        sql.SQL(', ').join(sql.Identifier(column) for column in df.columns),
+    )
+    cursor.copy_expert(statement.as_string(cursor), buffer)
+
+
+# helper function that moves the staged rows into the target table. With key columns, rows whose key is already in
+# the table update it (only when a value changed) and a key staged twice keeps its last row: the staging table is
+# created and only appended to by COPY in this transaction, so there its ctid order is the order rows were copied in
+def merge_staging(cursor, staging: str, table: str, columns: list, key_columns: list = None):
+    column_list = sql.SQL(', ').join(sql.Identifier(column) for column in columns)
+    if not key_columns:
+        cursor.execute(sql.SQL('INSERT INTO {} ({}) SELECT {} FROM {}').format(
+            sql.Identifier(table), column_list, column_list, sql.Identifier(staging)
+        ))
+        return
+
+    key_list = sql.SQL(', ').join(sql.Identifier(column) for column in key_columns)
+    updated = [column for column in columns if column not in key_columns]
+    if updated:
+        conflict = sql.SQL('DO UPDATE SET {} WHERE ({}) IS DISTINCT FROM ({})').format(
+            sql.SQL(', ').join(sql.SQL('{} = EXCLUDED.{}').format(sql.Identifier(column), sql.Identifier(column)) for column in updated),
+            sql.SQL(', ').join(sql.SQL('{}.{}').format(sql.Identifier(table), sql.Identifier(column)) for column in updated),
+            sql.SQL(', ').join(sql.SQL('EXCLUDED.{}').format(sql.Identifier(column)) for column in updated),
+        )
+    else:
+        conflict = sql.SQL('DO NOTHING')
+    cursor.execute(sql.SQL(
+        'INSERT INTO {} ({}) SELECT DISTINCT ON ({}) {} FROM {} ORDER BY {}, ctid DESC ON CONFLICT ({}) {}'
+    ).format(
+        sql.Identifier(table), column_list, key_list, column_list, sql.Identifier(staging), key_list, key_list, conflict
+    ))
+
+
+def ensure_versions_table(conn):
+    """A function to create the table of data versions if it doesn't exist yet.
+
+    Args:
+        conn: An open psycopg2 connection
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(create_versions_table)
+    conn.commit()
+
+
+# helper function that names the unique index of a table's key columns
+def unique_index_name(table: str, key_columns: list) -> str:
+    return table + '_' + '_'.join(key_columns) + '_key'
+
+
+def add_unique_index(conn, table: str, key_columns: list = upsert_key) -> int:
+    """A function to add the unique index an upsert into a table needs, a one-off migration (see collect.py --dedupe).
+
+    Rows loaded before the index existed can repeat a key, so those duplicates are deleted first. The tables don't
+    record when a row was loaded, so the row kept is the one with the highest ctid, which is not necessarily the last
+    one loaded (VACUUM and updates move rows around); the next collection of that player rewrites it anyway.
+
+    Args:
+        conn: An open psycopg2 connection
+        table (str): The table to index
+        key_columns (list): The columns that identify a row (default = name, year, date)
+
+    Returns:
+        int: The number of duplicate rows deleted
+
+    """
+
+    index = unique_index_name(table, key_columns)
+    removed = 0
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [index])
+        if cursor.fetchone()[0] is None:
+            cursor.execute(sql.SQL('DELETE FROM {} a USING {} b WHERE a.ctid < b.ctid AND {}').format(
+                sql.Identifier(table), sql.Identifier(table),
+                sql.SQL(' AND ').join(
+                    sql.SQL('a.{} IS NOT DISTINCT FROM b.{}').format(sql.Identifier(column), sql.Identifier(column))
+                    for column in key_columns
+                ),
+            ))
+            removed = cursor.rowcount
+            if removed:
+                cursor.execute(bump_version, [table])
+            cursor.execute(sql.SQL('CREATE UNIQUE INDEX {} ON {} ({})').format(
+                sql.Identifier(index), sql.Identifier(table),
+                sql.SQL(', ').join(sql.Identifier(column) for column in key_columns),
+            ))
+    conn.commit()
+    sys.stdout.write('removed ' + str(removed) + ' duplicate rows from ' + table + '\n')
+    return removed
+
+
+def check_unique_index(conn, table: str, key_columns: list = upsert_key):
+    """A function to check that a table has the unique index an upsert into it needs.
+
+    Args:
+        conn: An open psycopg2 connection
+        table (str): The table to upsert into
+        key_columns (list): The columns that identify a row (default = name, year, date)
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [unique_index_name(table, key_columns)])
+        exists = cursor.fetchone()[0] is not None
+    conn.commit()
+    if not exists:
+        raise Exception(table + ' has no unique index on ' + ', '.join(key_columns)
+                        + '; add it once with collect.py --dedupe (deletes duplicate rows)')
+
+
+def concat_frames(frames: list, constants: list = None, key_columns: list = None) -> pd.DataFrame:
+    """A function to assemble a batch of frames into one typed DataFrame.
+
+    The frames are concatenated once, then each frame's constant columns (e.g. the player's name and season) are
+    filled in for its rows by repeating the values over the frame lengths, instead of being added to every frame.
+    Categorical columns whose categories differ between frames are re-encoded, so the batch keeps the frames' dtypes.
+    With key columns, a key that appears more than once in the batch keeps its last row.
+
+    Args:
+        frames (list): The DataFrames, with the same columns
+        constants (list): One dict of column -> value per frame, or None (default = no constant columns)
+        key_columns (list): The columns that identify a row (default = no dedupe)
+
+    Returns:
+        pandas.DataFrame: The batch
+
+    """
+
+    constants = constants or [None] * len(frames)
+    batch = [(frame, values or {}) for frame, values in zip(frames, constants) if not frame.empty]
+    if not batch:
+        return pd.DataFrame()
+    df = pd.concat([frame for frame, _ in batch], ignore_index=True)
+
+    categories = [column for column, dtype in batch[0][0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if categories:
+        df = df.astype({column: 'category' for column in categories})
+
+    lengths = [len(frame) for frame, _ in batch]
+    for column in batch[0][1]:
+        df[column] = np.repeat([values[column] for _, values in batch], lengths)
+
+    if key_columns:
+        df = df.drop_duplicates(subset=key_columns, keep='last', ignore_index=True)
+    return df
+
+
+def load_frames(conn, frames: list, table: str, key_columns: list = None, constants: list = None) -> int:
+    """A function to bulk load DataFrames into a table in a single transaction.
+
+    The frames are concatenated and streamed with COPY into a temporary staging table shaped like the target,
+    then merged into the target with one INSERT ... SELECT, so the whole batch is one round trip per step
+    instead of one INSERT per row. With key columns the merge is an upsert (INSERT ... ON CONFLICT DO UPDATE)
+    that needs a unique index on them (see add_unique_index). The table's data version is bumped in the same
+    transaction, so the data_versions table must exist (see ensure_versions_table).
+
+    Args:
+        conn: An open psycopg2 connection
+        frames (list): The DataFrames to load; their columns must exist in the table
+        table (str): The table to load into
+        key_columns (list): The columns that identify a row, to update rows already in the table instead of
+            adding them again (default = append every row)
+        constants (list): One dict of column -> value per frame, filled in for the frame's rows (see concat_frames)
+
+    Returns:
+        int: The number of rows staged
+
+    """
+
+    df = concat_frames(frames, constants, key_columns)
+    if df.empty:
+        return 0
+    staging = table + '_staging'
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL('CREATE TEMP TABLE IF NOT EXISTS {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP').format(
+            sql.Identifier(staging), sql.Identifier(table)
+        ))
+        copy_frame(cursor, df, staging)
+        merge_staging(cursor, staging, table, list(df.columns), key_columns)
+        cursor.execute(bump_version, [table])
+    return len(df)
+
+
+class BulkLoader:
+    """A buffer of collected game logs that are loaded into a table a batch of players at a time.
+
+    Args:
+        conn: An open psycopg2 connection
+        table (str): The table to load into (e.g. 'profootball_wr_upload')
+        batch_size (int): The number of players loaded per transaction (default = FF_LOAD_BATCH_SIZE or 50)
+        max_rows (int): The number of rows that loads a batch early (default = FF_LOAD_MAX_ROWS or 20000)
+        max_bytes (int): The in-memory size that loads a batch early (default = FF_LOAD_MAX_BYTES or 64 MB)
+        key_columns (list): The columns that identify a row, to upsert on (e.g. upsert_key; default = append). The
+            table must have a unique index on them, see add_unique_index
+        on_flush (callable): A function taking a cursor and the keys of the loaded players, run in the same
+            transaction as the load (e.g. to mark the players as loaded)
+        on_commit (callable): A function taking the keys of the loaded players, run once the load is committed
+
+    """
+
+    def __init__(self, conn, table: str, batch_size: int = default_batch_size, key_columns: list = None, on_flush=None,
+                 on_commit=None, max_rows: int = default_max_rows, max_bytes: int = default_max_bytes):
+        self.conn = conn
+        self.table = table
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.key_columns = key_columns
+        self.on_flush = on_flush
+        self.on_commit = on_commit
+        self.frames = []
+        self.constants = []
+        self.keys = []
+        self.rows = 0
+        self.bytes = 0
+        ensure_versions_table(conn)
+        if key_columns:
+            check_unique_index(conn, table, key_columns)
+
+    def add(self, frame: pd.DataFrame, key=None, constants: dict = None):
+        """A function to queue a player's game log, loading the batch once it is full.
+
+        Args:
+            frame (pandas.DataFrame): The rows to load
+            key: What identifies the player to on_flush (e.g. the player's name)
+            constants (dict): Columns with the same value on every row (e.g. name and year), added at load time
+
+        """
+
+        self.frames.append(frame)
+        self.constants.append(constants)
+        self.keys.append(key)
+        self.rows += len(frame)
+        self.bytes += int(frame.memory_usage(deep=True).sum())
+        if len(self.frames) >= self.batch_size or self.rows >= self.max_rows or self.bytes >= self.max_bytes:
+            self.flush()
+
+    def flush(self) -> int:
+        """A function to load every queued game log and commit.
+
+        Returns:
+            int: The number of rows staged
+
+        """
+
+        if not self.keys:
+            return 0
+        try:
+            rows = load_frames(self.conn, self.frames, self.table, self.key_columns, self.constants)
+            if self.on_flush:
+                with self.conn.cursor() as cursor:
+                    self.on_flush(cursor, self.keys)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        sys.stdout.write('loaded ' + str(rows) + ' rows for ' + str(len(self.keys)) + ' players into ' + self.table + '\n')
+        keys = self.keys
+        self.frames = []
+        self.constants = []
+        self.keys = []
+        self.rows = 0
+        self.bytes = 0
+        if self.on_commit:
+            self.on_commit(keys)
+        return rows
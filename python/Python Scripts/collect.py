@@ -0,0 +1,217 @@
+import argparse
+import sys
+
+import bulk_loader
+import collection_engine
+import collector_sql
+import db
+import fantasy_points
+import job_queue
+import parse_pool
+import rolling_stats
+import run_manifest
+from nfl_calendar import current_season, latest_completed_week, parse_seasons
+from player_advanced_game_log import get_player_advanced_game_log
+from player_game_log import get_player_game_log
+
+positions = ['QB', 'RB', 'WR']
+scrapers = {'basic': get_player_game_log, 'advanced': get_player_advanced_game_log}
+# (position, kind) combinations that have loaded / upload tables; RB advanced game logs were never collected
+collections = [('QB', 'basic'), ('QB', 'advanced'), ('RB', 'basic'), ('WR', 'basic'), ('WR', 'advanced')]
+
+# fields of a footballdb_players row
+name_field = 4
+url_field = 6
+
+
+def collect(conn, position: str, kind: str, season: int, workers: int = collection_engine.default_workers,
+            incremental: bool = False, manifest: run_manifest.RunManifest = None):
+    """A function to collect the game logs of every player of a position whose season isn't loaded yet.
+
+    The players are queued as jobs and claimed a batch at a time, so several collectors can drain the same queue.
+    Each batch is fetched and parsed on `workers` threads and upserted in one transaction, which also saves the
+    players' urls and marks their jobs done. A player whose game log can't be fetched doesn't stop the others: after
+    a transient error (network, throttling) its job goes back in the queue to be retried after the rest, after any
+    other error it is given up on.
+
+    Every claimed player's outcome is checkpointed to the run's manifest, so an interrupted run can be resumed:
+    a (position, kind, season) the run already finished is skipped, and players it claimed but never finished are
+    put back in the queue.
+
+    In incremental mode only the players who played a completed week after the last week already uploaded for them
+    are collected instead, so a weekly in-season refresh only fetches the players with new games. Their whole game
+    log is upserted, which inserts the new weeks and rewrites earlier rows only where a stat was corrected.
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play. Must be 'QB', 'RB' or 'WR'
+        kind (str): 'basic' or 'advanced'
+        season (int): The season to collect
+        workers (int): The number of players fetched at once
+        incremental (bool): Collect only the players with new completed weeks (default = False)
+        manifest (RunManifest): The run's manifest (default = a new run)
+
+    """
+
+    if (position, kind) not in collections:
+        raise Exception('Cannot collect ' + kind + ' ' + position + ' game logs: there are no tables for them')
+    manifest = manifest or run_manifest.RunManifest(run_manifest.new_run_id(), {})
+    combination = position + ' ' + kind + ' ' + str(season)
+    state = manifest.combination(combination)
+    if state['finished']:
+        sys.stdout.write(combination + ': already collected by run ' + manifest.run_id + '\n')
+        return
+
+    scraper = scrapers[kind]
+    player_urls = []
+    batch_players = []
+
+    # runs on a worker thread: fetch and parse the player's game log
+    def load_player(player):
+        sys.stdout.write('loading ' + player[name_field] + '\n')
+        return scraper(player=player[name_field], position=position, season=season, player_url=player[url_field])
+
+    # runs on the main thread: queue the player's game log for the next bulk load
+    def write_player(player, result):
+        game_log, url = result
+        if url:
+            player_urls.append((player[name_field], url))
+        batch_players.append(player[name_field])
+        # games already in the table are matched on (name, year, date) and updated in place if their stats changed
+        loader.add(game_log, player[-1], {'name': player[name_field], 'year': season})  # keyed by the job id
+        sys.stdout.write(player[name_field] + ' queued' + '\n')
+
+    # runs in the same transaction as the bulk load: save the batch's urls, update its players' fantasy points and
+    # rolling stats and mark its jobs done
+    def finish_batch(cursor, job_ids):
+        collector_sql.update_player_urls(cursor, player_urls)
+        player_urls.clear()
+        if kind == 'basic':
+            fantasy_points.update(cursor, position, season, batch_players)
+        if position in rolling_stats.positions:
+            rolling_stats.update(cursor, position, batch_players)
+        batch_players.clear()
+        job_queue.complete(cursor, job_ids)
+
+    # runs once the bulk load is committed: checkpoint the batch's players
+    def checkpoint(job_ids):
+        manifest.succeeded(job_ids)
+        manifest.save()
+
+    def report_error(player, e):
+        print(e)
+        retry = run_manifest.is_transient(e)
+        requeued = job_queue.fail(conn, player[-1], e, retry)
+        manifest.failed(player[-1], e, requeued)
+        manifest.save()
+        sys.stdout.write('ERROR:' + player[name_field] + ' unable to retrieve ' + position + ' ' + kind + ' game log'
+                         + (', will retry' if requeued else '') + '\n')
+
+    if not state['enqueued']:
+        if incremental:
+            through_week = latest_completed_week(season)
+            queued = job_queue.enqueue_new_weeks(conn, position, kind, season, through_week)
+            sys.stdout.write(combination + ': new games through week ' + str(through_week) + '\n')
+        else:
+            queued = job_queue.enqueue(conn, position, kind, season)
+        sys.stdout.write(combination + ': ' + str(queued) + ' players queued' + '\n')
+        state['enqueued'] = True
+        manifest.save()
+    else:
+        job_queue.release(conn, manifest.unfinished(combination))
+
+    loader = bulk_loader.BulkLoader(conn, job_queue.upload_table(position, kind), key_columns=bulk_loader.upsert_key,
+                                    on_flush=finish_batch, on_commit=checkpoint)
+    while True:
+        players = job_queue.claim(conn, position, kind, season)
+        if not players:
+            break
+        for player in players:
+            manifest.attempted(player[-1], player[name_field], combination)
+        manifest.save()
+        collection_engine.run(players, load_player, write_player, workers=workers, on_error=report_error,
+                              isolate_errors=True)
+        loader.flush()
+
+    state['finished'] = True
+    manifest.save()
+
+
+# helper function that adds the unique index upserts need to the upload tables, deleting duplicate rows
+def dedupe(position_kinds: list):
+    conn = db.raw_connection()
+    try:
+        bulk_loader.ensure_versions_table(conn)
+        for position, kind in position_kinds:
+            bulk_loader.add_unique_index(conn, job_queue.upload_table(position, kind), bulk_loader.upsert_key)
+    finally:
+        conn.close()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description='Collect pro-football-reference game logs into the database.')
+    parser.add_argument('--position', nargs='+', choices=positions, type=str.upper,
+                        help='the positions to collect')
+    parser.add_argument('--kind', nargs='+', choices=list(scrapers), default=['basic'],
+                        help='basic and/or advanced game logs (default: basic)')
+    parser.add_argument('--seasons', type=parse_seasons, default=[current_season()],
+                        help="a season, a range like '2019-2023' or a list like '2019,2021' (default: current season)")
+    parser.add_argument('--workers', type=int, default=collection_engine.default_workers,
+                        help='the number of players fetched at once (default: FF_WORKERS or 4)')
+    parser.add_argument('--parse-workers', type=int, default=parse_pool.default_workers,
+                        help='the number of processes pages are parsed in, 0 parses on the fetch threads '
+                             '(default: FF_PARSE_WORKERS or 0)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only collect players who played a completed week that is not uploaded yet')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='continue an interrupted run with its original arguments')
+    parser.add_argument('--dedupe', action='store_true',
+                        help="delete duplicate rows from the --position/--kind tables and add the unique index they're "
+                             'upserted on, then exit (once, before the first collection into older tables)')
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+
+    if args.resume:
+        # a resumed run reuses its original arguments, so any others would be silently ignored
+        others = [arg for arg in argv if arg.startswith('--') and arg.split('=')[0] != '--resume']
+        if others:
+            parser.error('--resume takes no other arguments, got ' + ' '.join(others))
+        manifest = run_manifest.RunManifest.load(args.resume)
+        settings = manifest.args
+    elif args.position:
+        unsupported = [position + ' ' + kind for position in args.position for kind in args.kind
+                       if (position, kind) not in collections]
+        if unsupported:
+            parser.error('no tables to collect ' + ', '.join(unsupported) + ' game logs into (supported: '
+                         + ', '.join(position + ' ' + kind for position, kind in collections) + ')')
+        if args.dedupe:
+            dedupe([(position, kind) for position in args.position for kind in args.kind])
+            return
+        settings = {'positions': args.position, 'kinds': args.kind, 'seasons': args.seasons, 'workers': args.workers,
+                    'parse_workers': args.parse_workers, 'incremental': args.incremental}
+        manifest = run_manifest.RunManifest(run_manifest.new_run_id(), settings)
+    else:
+        parser.error('--position is required unless resuming a run')
+    sys.stdout.write('run ' + manifest.run_id + ' (resume with --resume ' + manifest.run_id + ')' + '\n')
+
+    # one process for every combination, so the HTTP session, player index, parser processes and database pool are
+    # shared
+    parse_pool.configure(settings.get('parse_workers', 0))
+    conn = db.raw_connection()
+    try:
+        job_queue.ensure_table(conn)
+        fantasy_points.ensure_table(conn)
+        rolling_stats.ensure_table(conn)
+        for season in settings['seasons']:
+            for position in settings['positions']:
+                for kind in settings['kinds']:
+                    collect(conn, position, kind, season, settings['workers'], settings['incremental'], manifest)
+    finally:
+        conn.close()
+        parse_pool.get_pool().shutdown()
+        manifest.save()
+        sys.stdout.write('run ' + manifest.run_id + ': ' + str(manifest.summary()) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import rate_limiter
+
+default_workers = int(os.environ.get('FF_WORKERS', 4))
+
+
+def run(jobs: list, load, write, workers: int = default_workers, on_error=None, requests_per_minute: float = None,
+        isolate_errors: bool = False):
+    """A function to collect many players' game logs concurrently.
+
+    `load` (fetch + parse) runs on a pool of worker threads, so while one page is being parsed the next ones are
+    already being downloaded. Every request goes through the shared token-bucket rate limiter, so the run as a whole
+    stays inside the site's request budget no matter how many workers there are. `write` runs on the calling thread
+    as each job completes, so database connections never have to be shared between threads.
+
+    Args:
+        jobs (list): The jobs to run (e.g. rows of the players query)
+        load (callable): A function taking a job and returning its result, run on a worker thread
+        write (callable): A function taking a job and its result, run on the calling thread
+        workers (int): The number of jobs loaded at once (default = FF_WORKERS or 4)
+        on_error (callable): A function taking a job and the exception it raised, called before the run is aborted
+        requests_per_minute (float): The request budget for the run (default = rate limiter setting)
+        isolate_errors (bool): Keep going after a job's load fails, once on_error has handled it (default = abort the
+            run); a failed write always aborts it
+
+    """
+
+    if requests_per_minute:
+        rate_limiter.configure(requests_per_minute)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(load, job): job for job in jobs}
+        try:
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if on_error:
+                        on_error(job, e)
+                    if not isolate_errors:
+                        raise
+                    failed += 1
+                    continue
+                try:
+                    write(job, result)
+                except Exception as e:
+                    if on_error:
+                        on_error(job, e)
+                    raise
+        except BaseException:
+            # stop the jobs that have not started yet before aborting the run
+            for future in futures:
+                future.cancel()
+            raise
+
+    sys.stdout.write('completed ' + str(len(futures) - failed) + ' jobs, ' + str(failed) + ' failed' + '\n')
+    for host, metrics in rate_limiter.get_limiter().metrics().items():
+        sys.stdout.write(host + ': ' + str(metrics) + '\n')
@@ -0,0 +1,45 @@
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+page_size = 500  # rows sent per VALUES list
+
+# every value is sent as a parameter, so names like Ja'Marr Chase need no quoting and a whole batch is one statement
+update_urls = """
+UPDATE footballdb_players fdp SET url = v.url
+FROM (VALUES %s) AS v (name, url)
+WHERE fdp."Name" = v.name
+"""
+
+set_loaded = """
+UPDATE {} fdpl SET isloaded = true
+FROM (VALUES %s) AS v (name, year)
+WHERE fdpl.name = v.name AND fdpl.year = v.year
+"""
+
+
+def update_player_urls(cursor, urls: list):
+    """A function to save the game log urls found for a batch of players.
+
+    Args:
+        cursor: A psycopg2 cursor
+        urls (list): (footballdb name, url) pairs
+
+    """
+
+    if urls:
+        execute_values(cursor, update_urls, urls, page_size=page_size)
+
+
+def mark_loaded(cursor, table: str, players: list):
+    """A function to mark a batch of players' seasons as loaded.
+
+    Args:
+        cursor: A psycopg2 cursor
+        table (str): The table tracking what's loaded (e.g. 'profootball_wr_loaded')
+        players (list): (name, season) pairs
+
+    """
+
+    if players:
+        execute_values(cursor, sql.SQL(set_loaded).format(sql.Identifier(table)).as_string(cursor), players,
+                       page_size=page_size)
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd  # type: ignore
+from psycopg2 import sql
+
+import bulk_loader
+import db
+import job_queue
+from nfl_calendar import parse_seasons
+
+table = 'fantasy_points'
+key_columns = ['name', 'year', 'week', 'profile']
+positions = ['QB', 'RB', 'WR']  # TEs are uploaded with the WRs
+
+# points per unit of each game log stat
+standard = {
+    'pass_yds': 0.04, 'pass_td': 4, 'int': -2,
+    'rush_yds': 0.1, 'rush_td': 6,
+    'rec': 0, 'rec_yds': 0.1, 'rec_td': 6,
+    'fumbles': -2,
+}
+profiles = {
+    'standard': standard,
+    'half_ppr': dict(standard, rec=0.5),
+    'ppr': dict(standard, rec=1),
+}
+
+# custom profiles, e.g. {"te_premium": {"base": "ppr", "rec": 1.5}}; a profile's stats override its base's
+profiles_file = os.environ.get('FF_SCORING_PROFILES')
+
+create_table = """
+CREATE TABLE IF NOT EXISTS fantasy_points (
+    name text NOT NULL,
+    year integer NOT NULL,
+    week integer NOT NULL,
+    profile text NOT NULL,
+    position text NOT NULL,
+    points double precision NOT NULL,
+    PRIMARY KEY (name, year, week, profile)
+);
+CREATE INDEX IF NOT EXISTS fantasy_points_year_week ON fantasy_points (year, week, profile);
+"""
+
+# the game log rows of a season's players, or of every season when no season is given
+select_rows = """
+SELECT * FROM {}
+WHERE (%(season)s IS NULL OR year = %(season)s) AND (%(players)s IS NULL OR name = ANY(%(players)s))
+"""
+
+
+def add_profile(name: str, weights: dict, base: str = None):
+    """A function to add (or replace) a scoring profile.
+
+    Args:
+        name (str): The profile's name
+        weights (dict): Points per unit of each stat it scores, e.g. {'rec': 1.5}
+        base (str): A profile whose weights this one starts from (default = none)
+
+    """
+
+    profiles[name] = dict(profiles[base], **weights) if base else dict(weights)
+
+
+# helper function that adds the custom profiles of a JSON file
+def load_profiles(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        custom = json.load(f)
+    for name, weights in custom.items():
+        weights = dict(weights)
+        add_profile(name, weights, weights.pop('base', None))
+
+
+if profiles_file:
+    load_profiles(profiles_file)
+
+
+def score(game_log: pd.DataFrame, profile_names: list = None) -> pd.DataFrame:
+    """A function to compute the fantasy points of every game of a game log under each scoring profile.
+
+    Every game is scored under every profile with one matrix product of the stats (games x stats) and the profiles'
+    weights (stats x profiles). Stats missing from the game log (e.g. receiving for QBs) score nothing, and games
+    the player was inactive for are left out.
+
+    Args:
+        game_log (pandas.DataFrame): Game logs with name, year and week columns (e.g. a profootball_*_upload table)
+        profile_names (list): The profiles to score (default = all)
+
+    Returns:
+        pandas.DataFrame: One row per (name, year, week, profile) with its points
+
+    """
+
+    profile_names = profile_names or list(profiles)
+    if 'inactive' in game_log.columns:
+        game_log = game_log[~game_log['inactive'].fillna(False).astype(bool)]
+    game_log = game_log[game_log['week'].notna()]
+
+    weights = pd.DataFrame({name: profiles[name] for name in profile_names}).fillna(0)
+    stats = [stat for stat in weights.index if stat in game_log.columns]
+    values = game_log[stats].astype('float64').fillna(0).to_numpy()
+    points = (values @ weights.loc[stats].to_numpy(dtype='float64')).round(2)
+
+    n = len(game_log)
+    return pd.DataFrame({
+        'name': np.repeat(game_log['name'].to_numpy(), len(profile_names)),
+        'year': np.repeat(game_log['year'].astype('int64').to_numpy(), len(profile_names)),
+        'week': np.repeat(game_log['week'].astype('int64').to_numpy(), len(profile_names)),
+        'profile': np.tile(profile_names, n),
+        'points': points.reshape(-1),
+    })
+
+
+def ensure_table(conn):
+    """A function to create the fantasy points table if it doesn't exist yet.
+
+    Args:
+        conn: An open psycopg2 connection
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(create_table)
+    conn.commit()
+    bulk_loader.ensure_versions_table(conn)
+
+
+# helper function that reads game log rows through a cursor, so rows written earlier in its transaction are seen
+def read_rows(cursor, position: str, season: int = None, players: list = None) -> pd.DataFrame:
+    cursor.execute(sql.SQL(select_rows).format(sql.Identifier(job_queue.upload_table(position, 'basic'))),
+                   {'season': season, 'players': players})
+    return pd.DataFrame(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+
+def update(cursor, position: str, season: int = None, players: list = None, profile_names: list = None) -> int:
+    """A function to recompute the fantasy points of some players' games, in the caller's transaction.
+
+    Only the players' rows are read and scored, and the points are upserted, so a row is only rewritten when its
+    points changed (a stat correction, or a profile's weights).
+
+    Args:
+        cursor: A cursor of the transaction that wrote the game logs
+        position (str): The position the players play. Must be 'QB', 'RB' or 'WR'
+        season (int): The season to score (default = every season)
+        players (list): The players' names (default = every player)
+        profile_names (list): The profiles to score (default = all)
+
+    Returns:
+        int: The number of (game, profile) rows upserted
+
+    """
+
+    if players is not None and not players:
+        return 0
+    game_log = read_rows(cursor, position, season, players)
+    if game_log.empty:
+        return 0
+    points = score(game_log, profile_names)
+    points['position'] = position
+    return bulk_loader.load_frames(cursor.connection, [points], table, key_columns)
+
+
+def refresh(conn, position: str, season: int = None, players: list = None, profile_names: list = None) -> int:
+    """A function to recompute and commit the fantasy points of a position's games (e.g. to backfill the table).
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play. Must be 'QB', 'RB' or 'WR'
+        season (int): The season to score (default = every season)
+        players (list): The players' names (default = every player)
+        profile_names (list): The profiles to score (default = all)
+
+    Returns:
+        int: The number of (game, profile) rows upserted
+
+    """
+
+    try:
+        with conn.cursor() as cursor:
+            rows = update(cursor, position, season, players, profile_names)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    sys.stdout.write('scored ' + str(rows) + ' ' + position + ' games' + (' in ' + str(season) if season else '') + '\n')
+    return rows
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description='Compute the fantasy points table from the uploaded game logs.')
+    parser.add_argument('--position', nargs='+', choices=positions, type=str.upper, default=positions,
+                        help='the positions to score (default: all)')
+    parser.add_argument('--seasons', type=parse_seasons,
+                        help="a season, a range like '2019-2023' or a list like '2019,2021' (default: every season)")
+    parser.add_argument('--profile', nargs='+', choices=list(profiles),
+                        help='the scoring profiles to compute (default: all)')
+    args = parser.parse_args(argv)
+
+    conn = db.raw_connection()
+    try:
+        ensure_table(conn)
+        for position in args.position:
+            for season in args.seasons or [None]:
+                refresh(conn, position, season, profile_names=args.profile)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+import numpy as np
+import pandas as pd  # type: ignore
+
+inactive_reasons = {'Inactive', 'Did Not Play', 'Injured Reserve', 'COVID-19 List'}
+
+# data-stats that are still filled in for inactive or DNP games
+game_info_stats = {'game_date', 'week_num', 'age', 'team', 'game_location', 'opp', 'game_result'}
+
+# [ df column, data-stat, type (, pandas dtype) ]
+# types: 'string', 'int', 'float' (a trailing % is dropped), 'started' (True if the cell has text),
+# 'result' / 'team_pts' / 'opp_pts' (parsed from 'W 27-20'), 'inactive' (True for inactive or DNP games)
+# the pandas dtype defaults to the type's entry in `dtypes` below
+game_info = [
+    ['date', 'game_date', 'string'],
+    ['week', 'week_num', 'int'],
+    ['age', 'age', 'float'],
+    ['team', 'team', 'string', 'category'],
+    ['game_location', 'game_location', 'string'],
+    ['opp', 'opp', 'string', 'category'],
+    ['result', 'game_result', 'result'],
+    ['team_pts', 'game_result', 'team_pts'],
+    ['opp_pts', 'game_result', 'opp_pts'],
+]
+
+# advanced game logs don't have the player's age
+advanced_game_info = [column for column in game_info if column[0] != 'age']
+
+rushing_and_receiving = [
+    ['rush_att', 'rush_att', 'int'],
+    ['rush_yds', 'rush_yds', 'int'],
+    ['yds_per_att', 'rush_yds_per_att', 'float'],
+    ['rush_td', 'rush_td', 'int'],
+    ['tgt', 'targets', 'int'],
+    ['rec', 'rec', 'int'],
+    ['rec_yds', 'rec_yds', 'int'],
+    ['rec_td', 'rec_td', 'int'],
+    ['yds_per_rec', 'rec_yds_per_rec', 'float'],
+    ['ctch_perc', 'catch_pct', 'float'],
+    ['yds_per_tgt', 'rec_yds_per_tgt', 'float'],
+]
+
+snaps = [
+    ['fumbles', 'fumbles_lost', 'int'],
+    ['snaps', 'offense', 'int'],
+    ['snap_pct', 'off_pct', 'float'],
+    ['inactive', None, 'inactive'],
+]
+
+qb_basic = game_info + [
+    ['started', 'gs', 'started'],
+    ['cmp', 'pass_cmp', 'int'],
+    ['att', 'pass_att', 'int'],
+    ['cmp_perc', 'pass_cmp_perc', 'float'],
+    ['pass_yds', 'pass_yds', 'int'],
+    ['pass_td', 'pass_td', 'int'],
+    ['int', 'pass_int', 'int'],
+    ['rating', 'pass_rating', 'float'],
+    ['sacked', 'pass_sacked', 'int'],
+    ['rush_att', 'rush_att', 'int'],
+    ['rush_yds', 'rush_yds', 'int'],
+    ['rush_td', 'rush_td', 'int'],
+] + snaps
+
+wr_basic = game_info + [['started', 'gs', 'started']] + rushing_and_receiving + snaps
+
+qb_advanced = advanced_game_info + [
+    ['cmp', 'pass_cmp', 'int'],
+    ['att', 'pass_att', 'int'],
+    ['pass_yds', 'pass_yds', 'int'],
+    ['first_down', 'pass_first_down', 'int'],
+    ['first_down_pct', 'pass_first_down_pct', 'float'],
+    ['pass_target_yds', 'pass_target_yds', 'float'],
+    ['pass_target_yds_per_att', 'pass_tgt_yds_per_att', 'float'],
+    ['pass_air_yds', 'pass_air_yds', 'int'],
+    ['pass_air_yds_per_cmp', 'pass_air_yds_per_cmp', 'float'],
+    ['pass_air_yds_per_att', 'pass_air_yds_per_att', 'float'],
+    ['pass_yac', 'pass_yac', 'float'],
+    ['pass_yac_per_cmp', 'pass_yac_per_cmp', 'float'],
+    ['pass_drops', 'pass_drops', 'int'],
+    ['pass_drop_pct', 'pass_drop_pct', 'float'],
+    ['pass_poor_throws', 'pass_poor_throws', 'int'],
+    ['pass_poor_throws_pct', 'pass_poor_throw_pct', 'float'],
+    ['pass_sacked', 'pass_sacked', 'int'],
+    ['pass_blitzed', 'pass_blitzed', 'int'],
+    ['pass_hurried', 'pass_hurried', 'int'],
+    ['pass_hits', 'pass_hits', 'int'],
+    ['pass_pressured', 'pass_pressured', 'int'],
+    ['pass_pressured_pct', 'pass_pressured_pct', 'float'],
+    ['rush_scrambles', 'rush_scrambles', 'int'],
+    ['rush_scrambles_yds_per_att', 'rush_scrambles_yds_per_att', 'float'],
+]
+
+# advanced receiving logs have always stored the full game result text (e.g. 'W 27-20') as the result
+wr_advanced = [
+    ['result', 'game_result', 'string'] if column[0] == 'result' else column for column in advanced_game_info
+] + [
+    ['tgt', 'targets', 'int'],
+    ['rec', 'rec', 'int'],
+    ['rec_yds', 'rec_yds', 'int'],
+    ['rec_td', 'rec_td', 'int'],
+    ['rec_first_down', 'rec_first_down', 'int'],
+    ['air_yds', 'rec_air_yds', 'int'],
+    ['air_yds_per_rec', 'air_yards_per_rec', 'float'],
+    ['yac', 'rec_yac', 'int'],
+    ['yac_per_rec', 'rec_yac_per_rec', 'float'],
+    ['adot', 'adot', 'float'],
+    ['broken_tackles', 'rec_broken_tackles', 'int'],
+    ['drops', 'rec_drops', 'int'],
+    ['drop_perc', 'rec_drop_pct', 'float'],
+    ['rec_pass_rating', 'rec_pass_rating', 'float'],
+]
+
+rb_advanced = advanced_game_info + [
+    ['rush_att', 'rush_att', 'int'],
+    ['rush_yds', 'rush_yds', 'int'],
+    ['rush_td', 'rush_td', 'int'],
+    ['tgt', 'targets', 'int'],
+    ['rec_yds', 'rec_yds', 'int'],
+    ['rec_td', 'rec_td', 'int'],
+]
+
+# (position, kind) -> schema. Basic game logs keep inactive games as rows, advanced ones drop them.
+# Inactive games are null outside the game info, except for the schema's inactive_values (df column -> value):
+# RB game logs have always stored started = False for them.
+# Advanced receiving logs have always stored empty text (e.g. game_location of home games) as null
+schemas = {
+    ('QB', 'basic'): {'columns': qb_basic, 'keep_inactive': True, 'inactive_values': {}, 'empty_string_null': False},
+    ('WR', 'basic'): {'columns': wr_basic, 'keep_inactive': True, 'inactive_values': {}, 'empty_string_null': False},
+    ('TE', 'basic'): {'columns': wr_basic, 'keep_inactive': True, 'inactive_values': {}, 'empty_string_null': False},
+    ('RB', 'basic'): {'columns': wr_basic, 'keep_inactive': True, 'inactive_values': {'started': False},
+                      'empty_string_null': False},
+    ('QB', 'advanced'): {'columns': qb_advanced, 'keep_inactive': False, 'inactive_values': {},
+                         'empty_string_null': False},
+    ('WR', 'advanced'): {'columns': wr_advanced, 'keep_inactive': False, 'inactive_values': {},
+                         'empty_string_null': True},
+    ('TE', 'advanced'): {'columns': wr_advanced, 'keep_inactive': False, 'inactive_values': {},
+                         'empty_string_null': True},
+    ('RB', 'advanced'): {'columns': rb_advanced, 'keep_inactive': False, 'inactive_values': {},
+                         'empty_string_null': False},
+}
+
+
+# helper function that tells whether a row is an inactive or DNP game (the reason is in the row's last cell)
+def is_inactive(cells: dict) -> bool:
+    return bool(cells) and next(reversed(cells.values())) in inactive_reasons
+
+
+# helper functions that turn a cell's text into a value, one per schema type
+def parse_number(text: str) -> str:
+    return text.replace('%', '') or 0
+
+
+def parse_score(text: str, side: int) -> int:
+    return int(text.split(' ')[1].split('-')[side])
+
+
+parsers = {
+    'string': lambda text: text,
+    'int': lambda text: int(parse_number(text)),
+    'float': lambda text: float(parse_number(text)),
+    'started': lambda text: bool(text),
+    'result': lambda text: text.split(' ')[0],
+    'team_pts': lambda text: parse_score(text, 0),
+    'opp_pts': lambda text: parse_score(text, 1),
+}
+
+# pandas (nullable) dtype of each schema type. Single-game stats fit in Int16; floats stay 64-bit so the
+# values written to the database's float8 columns aren't changed by rounding
+dtypes = {
+    'string': 'string',
+    'int': 'Int16',
+    'float': 'Float64',
+    'started': 'boolean',
+    'result': 'string',
+    'team_pts': 'Int16',
+    'opp_pts': 'Int16',
+    'inactive': 'boolean',
+}
+
+# numpy buffer each pandas dtype is filled in (object for text)
+buffer_types = {
+    'string': object,
+    'category': object,
+    'Int16': np.int16,
+    'Float64': np.float64,
+    'boolean': np.bool_,
+}
+
+_compiled = {}
+
+
+# helper function that turns a schema into (column, data-stat, type, parser, dtype, filled for inactive games)
+# tuples, once
+def compile_schema(position: str, kind: str) -> dict:
+    key = (position, kind)
+    if key not in _compiled:
+        schema = schemas[key]
+        _compiled[key] = dict(schema, columns=[
+            (entry[0], entry[1], entry[2], parsers.get(entry[2]), entry[3] if len(entry) > 3 else dtypes[entry[2]],
+             entry[1] in game_info_stats)
+            for entry in schema['columns']
+        ])
+    return _compiled[key]
+
+
+def schema_dtypes(position: str, kind: str) -> dict:
+    """A function to return the explicit column types of a (position, kind) game log.
+
+    Args:
+        position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+        kind (str): 'basic' or 'advanced'
+
+    Returns:
+        dict: df column -> pandas dtype, in column order
+
+    """
+
+    return {column: dtype for column, _, _, _, dtype, _ in compile_schema(position, kind)['columns']}
+
+
+# helper function that wraps a filled buffer and its null mask in a pandas (nullable) array, without copying
+def finish_column(values: np.ndarray, nulls: np.ndarray, dtype: str):
+    if dtype == 'Int16':
+        return pd.arrays.IntegerArray(values, nulls)
+    if dtype == 'Float64':
+        return pd.arrays.FloatingArray(values, nulls)
+    if dtype == 'boolean':
+        return pd.arrays.BooleanArray(values, nulls)
+    values[nulls] = None
+    if dtype == 'category':
+        return pd.Categorical(values)
+    return pd.array(values, dtype=dtype)
+
+
+def extract_columns(table_rows: list, position: str, kind: str) -> dict:
+    """A function to parse a stats table's rows into compact column arrays, driven by the (position, kind) schema.
+
+    Every column is preallocated from the row count as a typed buffer plus a null mask and filled in one pass over
+    the rows. Stats that are missing or empty on a row are 0; for inactive games (kept only in basic game logs) they
+    are null, or the schema's inactive value. The arrays are cheap to send between processes, see build_frame to turn them into a DataFrame.
+
+    Args:
+        table_rows (list): The table's rows, as data-stat -> text dicts
+        position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+        kind (str): 'basic' or 'advanced'
+
+    Returns:
+        dict: df column -> (values, null mask, pandas dtype), in column order
+
+    """
+
+    schema = compile_schema(position, kind)
+    columns = schema['columns']
+    inactive_values = schema['inactive_values']
+
+    inactive = [is_inactive(cells) for cells in table_rows]
+    rows = [(cells, flag) for cells, flag in zip(table_rows, inactive) if schema['keep_inactive'] or not flag]
+    n = len(rows)
+
+    values = {column: np.zeros(n, dtype=buffer_types[dtype]) for column, _, _, _, dtype, _ in columns}
+    nulls = {column: np.zeros(n, dtype=np.bool_) for column, _, _, _, _, _ in columns}
+
+    for i, (cells, flag) in enumerate(rows):
+        for column, stat, type_, parse, _, game_info_column in columns:
+            if type_ == 'inactive':
+                values[column][i] = flag
+            elif flag and column in inactive_values:
+                values[column][i] = inactive_values[column]
+            elif flag and not game_info_column:
+                nulls[column][i] = True
+            else:
+                text = cells.get(stat, '')
+                if not text and type_ == 'string' and schema['empty_string_null']:
+                    nulls[column][i] = True
+                else:
+                    values[column][i] = parse(text)
+
+    return {column: (values[column], nulls[column], dtype) for column, _, _, _, dtype, _ in columns}
+
+
+# helper function that wraps the column arrays of extract_columns in a DataFrame with the schema's nullable dtypes
+def build_frame(columns: dict) -> pd.DataFrame:
+    return pd.DataFrame({column: finish_column(values, nulls, dtype) for column, (values, nulls, dtype) in columns.items()})
+
+
+def extract(table_rows: list, position: str, kind: str) -> pd.DataFrame:
+    """A function to build a game log DataFrame from a stats table's rows, driven by the (position, kind) schema.
+
+    Args:
+        table_rows (list): The table's rows, as data-stat -> text dicts
+        position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+        kind (str): 'basic' or 'advanced'
+
+    Returns:
+        pandas.DataFrame: Each game is a row of the DataFrame, with the schema's columns and dtypes
+
+    """
+
+    return build_frame(extract_columns(table_rows, position, kind))
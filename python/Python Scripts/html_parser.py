@@ -0,0 +1,110 @@
+import importlib.util
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+backends = ['selectolax', 'lxml', 'html.parser']
+
+
+# helper function that tells whether a parser backend's library is installed
+def is_available(backend: str) -> bool:
+    if backend == 'html.parser':
+        return True
+    try:
+        return importlib.util.find_spec('selectolax.lexbor' if backend == 'selectolax' else backend) is not None
+    except ImportError:
+        return False
+
+
+# fastest installed backend: selectolax (lexbor), then lxml, then the pure-Python html.parser
+default_backend = os.environ.get('FF_HTML_PARSER') or next(backend for backend in backends if is_available(backend))
+
+
+def get_soup(html: str, only: str = None, backend: str = None) -> BeautifulSoup:
+    """A function to parse a page into a BeautifulSoup object.
+
+    Args:
+        html (str): The page's HTML
+        only (str): A tag name (e.g. 'table'); if given, only those tags are built into the tree
+        backend (str): 'lxml' or 'html.parser' (default = FF_HTML_PARSER, or lxml when installed; selectolax
+            has no BeautifulSoup tree so it falls back to lxml here)
+
+    Returns:
+        BeautifulSoup: The parsed page
+
+    """
+
+    backend = backend or default_backend
+    if backend == 'selectolax':
+        backend = 'lxml' if is_available('lxml') else 'html.parser'
+    parse_only = SoupStrainer(only) if only else None
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
+# helper function that walks a table row once and maps each cell's data-stat to its text
+def row_cells(row) -> dict:
+    return {cell.get('data-stat'): cell.text for cell in row.find_all(['th', 'td'], recursive=False)}
+
+
+# helper function that does the same for a selectolax row
+def selectolax_row_cells(row) -> dict:
+    cells = {}
+    node = row.child
+    while node is not None:
+        if node.tag in ('th', 'td'):
+            cells[node.attributes.get('data-stat')] = node.text(deep=True)
+        node = node.next
+    return cells
+
+
+def table_rows(html: str, table_id: str = None, index: int = 0, backend: str = None) -> list:
+    """A function to extract the body rows of a stats table as data-stat -> text dicts.
+
+    Only the page's tables are parsed, the rest of the page is skipped without building a tree for it.
+
+    Args:
+        html (str): The page's HTML
+        table_id (str): The id of the table to read (default = the table at `index`)
+        index (int): The position of the table on the page, used when no id is given (default = 0)
+        backend (str): 'lxml', 'selectolax' or 'html.parser' (default = FF_HTML_PARSER, or the fastest installed)
+
+    Returns:
+        list: One dict per <tr> of the table's <tbody>
+
+    """
+
+    backend = backend or default_backend
+
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html)
+        table = tree.css_first('table#' + table_id) if table_id else tree.css('table')[index]
+        if table is None:
+            raise Exception('Cannot find table ' + str(table_id))
+        return [selectolax_row_cells(row) for row in table.css('tbody > tr')]
+
+    soup = get_soup(html, 'table', backend)
+    table = soup.find('table', id=table_id) if table_id else soup.find_all('table')[index]
+    if table is None:
+        raise Exception('Cannot find table ' + str(table_id))
+    return [row_cells(row) for row in table.find('tbody').find_all('tr', recursive=False)]
+
+
+def check_parity(html: str, table_id: str = None, index: int = 0) -> dict:
+    """A function to check that every installed backend reads a table exactly like html.parser does.
+
+    Args:
+        html (str): A saved page
+        table_id (str): The id of the table to read
+        index (int): The position of the table on the page, used when no id is given
+
+    Returns:
+        dict: backend -> True if its rows match the html.parser rows
+
+    """
+
+    expected = table_rows(html, table_id, index, 'html.parser')
+    return {
+        backend: table_rows(html, table_id, index, backend) == expected
+        for backend in backends if is_available(backend)
+    }
@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+
+import requests
+
+# cache settings, can be overridden through the environment
+cache_enabled = os.environ.get('FF_HTTP_CACHE', '1') != '0'
+cache_dir = os.environ.get('FF_HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http'))
+
+# cache policies
+IMMUTABLE = 'immutable'  # serve straight from disk, never go back to the site
+REVALIDATE = 'revalidate'  # serve from disk only after the site confirms the page has not changed
+
+
+# helper function that turns a url into its cache key
+def cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+# helper function that returns the body and metadata paths of a cache entry
+def entry_paths(url: str) -> tuple:
+    key = cache_key(url)
+    folder = os.path.join(cache_dir, key[:2])
+    return os.path.join(folder, key + '.html.gz'), os.path.join(folder, key + '.json')
+
+
+def load(url: str):
+    """A function to read a cached response from disk.
+
+    Args:
+        url (str): The url the response was fetched from
+
+    Returns:
+        tuple: The (body, metadata) of the cached response, or None if the url is not cached
+
+    """
+
+    body_path, meta_path = entry_paths(url)
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        with gzip.open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError, EOFError, zlib.error):  # a missing, truncated or corrupt entry is a cache miss
+        return None
+    return body, meta
+
+
+def store(url: str, response: requests.Response):
+    """A function to write a successful response to the disk cache.
+
+    The body is gzip-compressed and stored next to a small metadata file holding the validators
+    (ETag / Last-Modified) used to revalidate it later.
+
+    Args:
+        url (str): The url the response was fetched from
+        response (requests.Response): The response to cache
+
+    """
+
+    body_path, meta_path = entry_paths(url)
+    os.makedirs(os.path.dirname(body_path), exist_ok=True)
+    meta = {
+        'url': url,
+        'fetched_at': time.time(),
+        'encoding': response.encoding,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_type': response.headers.get('Content-Type'),
+    }
+
+    # write to temporary files first so concurrent readers never see a partial entry; each writer gets its own
+    # files, so concurrent writers of the same url can't interleave in one
+    write_entry_file(body_path, lambda f: f.write(gzip.compress(response.content)))
+    write_entry_file(meta_path, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+
+
+# helper function that writes a cache file through a uniquely named temporary file in the same folder, then moves it
+# into place
+def write_entry_file(path: str, write):
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                    delete=False)
+    try:
+        with f:
+            write(f)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+        raise
+
+
+# helper function that adds the conditional request headers for a cached entry
+def conditional_headers(meta: dict) -> dict:
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+
+# helper function that rebuilds a requests.Response object from a cache entry
+def build_response(url: str, body: bytes, meta: dict) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response._content = body
+    response.encoding = meta.get('encoding') or 'utf-8'
+    if meta.get('content_type'):
+        response.headers['Content-Type'] = meta['content_type']
+    response.from_cache = True
+    return response
@@ -0,0 +1,169 @@
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import http_cache
+import rate_limiter
+from nfl_calendar import is_completed_season
+
+# connection settings, can be overridden through the environment
+pool_size = int(os.environ.get('FF_HTTP_POOL_SIZE', 10))
+connect_timeout = float(os.environ.get('FF_HTTP_CONNECT_TIMEOUT', 5))
+read_timeout = float(os.environ.get('FF_HTTP_READ_TIMEOUT', 30))
+max_retries = int(os.environ.get('FF_HTTP_MAX_RETRIES', 3))
+max_throttled_retries = int(os.environ.get('FF_HTTP_MAX_THROTTLED_RETRIES', 3))
+backoff_factor = float(os.environ.get('FF_HTTP_BACKOFF', 1))
+
+server_error_statuses = (500, 502, 504)  # retried by request_site; 429 / 503 are left to the adaptive rate limiter
+
+default_headers = {
+    'User-Agent': 'Mozilla/5.0 (compatible; FantasyFootballReports/1.0)',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool: int = pool_size, retries: int = max_retries) -> requests.Session:
+    """A function to build a pooled, keep-alive HTTP session.
+
+    Connections to a host are kept open and reused by every request made through the session, and
+    requests that fail to connect or read are retried with exponential backoff. Error responses are returned
+    as they are, so request_site retries them through the rate limiter.
+
+    Args:
+        pool (int): The number of connections kept open per host
+        retries (int): The number of times a request that failed to connect or read is retried
+
+    Returns:
+        requests.Session: A session configured with the connection pool, retry policy and default headers
+
+    """
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=0,
+        backoff_factor=backoff_factor,
+        allowed_methods=['GET', 'HEAD'],
+    )
+    adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(default_headers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# helper function that returns the session shared by every scraper module
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+# helper function that picks the cache policy for a page belonging to a given season
+def cache_policy(season: int = None) -> str:
+    if season is not None and is_completed_season(season):
+        return http_cache.IMMUTABLE
+    return http_cache.REVALIDATE
+
+
+def fetch(url: str, session: requests.Session = None, timeout: tuple = None, season: int = None,
+          allowed_statuses: tuple = ()) -> requests.Response:
+    """A function to make a HTTP GET request through the shared (or given) session and the disk cache.
+
+    Pages of completed seasons never change, so once cached they are served from disk without touching the site.
+    Any other page is revalidated with its ETag / Last-Modified validators and only downloaded again if it changed.
+    Requests that do go to the site wait for a token from the shared rate limiter first, and are retried
+    after the site's Retry-After delay if it answers HTTP 429 / 503, or with exponential backoff if it answers
+    HTTP 500 / 502 / 504. Every retry waits for its own token.
+
+    Args:
+        url (str): The url to request
+        session (requests.Session): The HTTP session to make the request with (default = shared session)
+        timeout (tuple): The (connect, read) timeouts in seconds (default = module settings)
+        season (int): The season the page belongs to, if any. Used to pick the cache policy
+        allowed_statuses (tuple): Error statuses returned to the caller instead of raised (e.g. 404)
+
+    Returns:
+        requests.Response: The response, with a from_cache attribute telling whether it was served from disk
+
+    Raises:
+        rate_limiter.RateLimitedError: If the site is still throttling after every retry
+        requests.HTTPError: If the site answers with any other error (e.g. a 5xx it kept answering after the
+            retries), so an error page never reaches the parser
+
+    """
+
+    session = session or get_session()
+    timeout = timeout or (connect_timeout, read_timeout)
+
+    if not http_cache.cache_enabled:
+        response = request_site(session, url, timeout)
+        check_status(response, url, allowed_statuses)
+        response.from_cache = False
+        return response
+
+    cached = http_cache.load(url)
+    headers = {}
+    if cached:
+        body, meta = cached
+        if cache_policy(season) == http_cache.IMMUTABLE:
+            return http_cache.build_response(url, body, meta)
+        headers = http_cache.conditional_headers(meta)
+
+    # only requests that go to the site spend the request budget
+    response = request_site(session, url, timeout, headers)
+
+    # page has not changed since it was cached
+    if cached and response.status_code == 304:
+        return http_cache.build_response(url, body, meta)
+
+    check_status(response, url, allowed_statuses)
+    if response.status_code == 200:
+        http_cache.store(url, response)
+    response.from_cache = False
+    return response
+
+
+# helper function that raises for a response that isn't a page (or one of the statuses the caller handles itself)
+def check_status(response: requests.Response, url: str, allowed_statuses: tuple = ()):
+    if response.status_code != 200 and response.status_code not in allowed_statuses:
+        raise requests.HTTPError(str(response.status_code) + ' error requesting ' + url, response=response)
+
+
+# helper function that makes a request to the site within the adaptive request budget, retrying throttled requests
+# and server errors through the rate limiter so every attempt is counted against the budget
+def request_site(session: requests.Session, url: str, timeout: tuple, headers: dict = None) -> requests.Response:
+    limiter = rate_limiter.get_limiter()
+    host = urlparse(url).netloc
+    throttled = server_errors = 0
+    while True:
+        limiter.acquire(host)
+        response = session.get(url, timeout=timeout, headers=headers)
+        limiter.record(host, response.status_code, response.headers.get('Retry-After'))
+        if response.status_code in (429, 503):
+            throttled += 1
+            if throttled > max_throttled_retries:
+                raise rate_limiter.RateLimitedError(str(response.status_code) + ' error. ' + host + ' is still throttling requests to ' + url)
+            sys.stdout.write('throttled by ' + host + ', request rate now ' + str(round(limiter.current_rate(host), 1)) + '/min' + '\n')
+        elif response.status_code in server_error_statuses and server_errors < max_retries:
+            time.sleep(backoff_factor * 2 ** server_errors)
+            server_errors += 1
+            sys.stdout.write(str(response.status_code) + ' error from ' + host + ', retrying ' + url + '\n')
+        else:
+            return response
@@ -0,0 +1,242 @@
+import os
+
+from psycopg2 import sql
+
+import collector_sql
+
+claim_size = int(os.environ.get('FF_CLAIM_SIZE', 50))  # jobs claimed per round trip
+max_attempts = int(os.environ.get('FF_MAX_ATTEMPTS', 3))
+lease_seconds = int(os.environ.get('FF_JOB_LEASE', 3600))  # a running job older than this was abandoned
+
+create_table = """
+CREATE TABLE IF NOT EXISTS collection_jobs (
+    id serial PRIMARY KEY,
+    player text NOT NULL,
+    position text NOT NULL,
+    season integer NOT NULL,
+    kind text NOT NULL,
+    status text NOT NULL DEFAULT 'pending',
+    attempts integer NOT NULL DEFAULT 0,
+    error text,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    claimed_at timestamptz,
+    finished_at timestamptz,
+    UNIQUE (player, position, season, kind)
+);
+CREATE INDEX IF NOT EXISTS collection_jobs_open ON collection_jobs (position, kind, season) WHERE status <> 'done';
+"""
+
+# players that aren't loaded yet become pending jobs; jobs that were done or failed are reopened
+enqueue_jobs = """
+INSERT INTO collection_jobs (player, position, season, kind)
+SELECT DISTINCT fdpl.name, %(position)s, fdpl.year, %(kind)s
+FROM {} fdpl
+JOIN footballdb_players fdp ON fdp."profootball_name" = fdpl.name
+WHERE fdpl.year = %(season)s AND fdpl.isloaded IS NOT TRUE
+  AND fdp."Position" = %(position)s AND fdp."ignoreupload" = false
+ON CONFLICT (player, position, season, kind) DO UPDATE
+SET status = 'pending', attempts = 0, error = NULL, claimed_at = NULL, finished_at = NULL
+WHERE collection_jobs.status IN ('done', 'failed')
+"""
+
+# players who played a completed week after the last one in their uploaded game log become pending jobs
+enqueue_new_weeks = """
+INSERT INTO collection_jobs (player, position, season, kind)
+SELECT DISTINCT fdp."profootball_name", %(position)s, %(season)s, %(kind)s
+FROM {} w
+JOIN footballdb_players fdp ON fdp."Name" = w.name
+LEFT JOIN (SELECT name, max(week) AS week FROM {} WHERE year = %(season)s GROUP BY name) loaded
+  ON loaded.name = fdp."profootball_name"
+WHERE w.year = %(season)s AND w.week <= %(through_week)s AND w.week > coalesce(loaded.week, 0)
+  AND fdp."Position" = %(position)s AND fdp."ignoreupload" = false
+ON CONFLICT (player, position, season, kind) DO UPDATE
+SET status = 'pending', attempts = 0, error = NULL, claimed_at = NULL, finished_at = NULL
+WHERE collection_jobs.status IN ('done', 'failed')
+"""
+
+# pending (or abandoned) jobs are locked, skipping the ones another collector holds, and marked running in one
+# statement; each comes back as its footballdb_players row with the job id appended. Jobs that were put back after
+# an error come after the ones that haven't been tried yet
+claim_jobs = """
+WITH claimed AS (
+    SELECT id FROM collection_jobs
+    WHERE position = %(position)s AND kind = %(kind)s AND season = %(season)s
+      AND (status = 'pending' OR (status = 'running' AND claimed_at < now() - %(lease)s * interval '1 second'))
+    ORDER BY attempts, id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+), updated AS (
+    UPDATE collection_jobs j SET status = 'running', attempts = j.attempts + 1, claimed_at = now()
+    FROM claimed WHERE j.id = claimed.id
+    RETURNING j.id, j.player, j.position
+)
+SELECT DISTINCT ON (u.id) fdp.*, u.id
+FROM updated u
+JOIN footballdb_players fdp ON fdp."profootball_name" = u.player AND fdp."Position" = u.position
+ORDER BY u.id, fdp."Id"
+"""
+
+complete_jobs = """
+UPDATE collection_jobs SET status = 'done', error = NULL, finished_at = now()
+WHERE id = ANY(%s)
+RETURNING player, position, season, kind
+"""
+
+fail_job = """
+UPDATE collection_jobs
+SET status = CASE WHEN %(retry)s AND attempts < %(max_attempts)s THEN 'pending' ELSE 'failed' END,
+    error = %(error)s, finished_at = now()
+WHERE id = %(id)s
+RETURNING status
+"""
+
+release_jobs = """
+UPDATE collection_jobs SET status = 'pending', claimed_at = NULL
+WHERE id = ANY(%s) AND status = 'running'
+"""
+
+
+# helper function that returns the table tracking which players of a (position, kind) are loaded
+def loaded_table(position: str, kind: str) -> str:
+    return 'profootball_' + position.lower() + ('_advanced' if kind == 'advanced' else '') + '_loaded'
+
+
+# helper function that returns the table a (position, kind)'s game logs are uploaded to
+def upload_table(position: str, kind: str) -> str:
+    return 'profootball_' + position.lower() + ('_advanced' if kind == 'advanced' else '') + '_upload'
+
+
+def ensure_table(conn):
+    """A function to create the job table if it doesn't exist yet.
+
+    Args:
+        conn: An open psycopg2 connection
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(create_table)
+    conn.commit()
+
+
+def enqueue(conn, position: str, kind: str, season: int) -> int:
+    """A function to queue a job for every player of a position whose season isn't loaded yet.
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play (e.g. 'WR')
+        kind (str): 'basic' or 'advanced'
+        season (int): The season to collect
+
+    Returns:
+        int: The number of jobs queued or reopened
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL(enqueue_jobs).format(sql.Identifier(loaded_table(position, kind))),
+                       {'position': position, 'kind': kind, 'season': season})
+        queued = cursor.rowcount
+    conn.commit()
+    return queued
+
+
+def enqueue_new_weeks(conn, position: str, kind: str, season: int, through_week: int) -> int:
+    """A function to queue a job for every player of a position who played since their game log was last loaded.
+
+    The weeks a player played come from the position's footballdb weekly table ({pos}_weekly), the weeks already
+    loaded from the latest week in the player's uploaded game log.
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play (e.g. 'WR')
+        kind (str): 'basic' or 'advanced'
+        season (int): The season to collect
+        through_week (int): The latest completed week of the season
+
+    Returns:
+        int: The number of jobs queued or reopened
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL(enqueue_new_weeks).format(
+            sql.Identifier(position.lower() + '_weekly'), sql.Identifier(upload_table(position, kind))
+        ), {'position': position, 'kind': kind, 'season': season, 'through_week': through_week})
+        queued = cursor.rowcount
+    conn.commit()
+    return queued
+
+
+def claim(conn, position: str, kind: str, season: int, limit: int = claim_size) -> list:
+    """A function to claim a batch of pending jobs, safe to call from several collectors at once.
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play (e.g. 'WR')
+        kind (str): 'basic' or 'advanced'
+        season (int): The season to collect
+        limit (int): The most jobs to claim (default = FF_CLAIM_SIZE or 50)
+
+    Returns:
+        list: The claimed players' footballdb_players rows, each with its job id as the last field
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(claim_jobs, {
+            'position': position, 'kind': kind, 'season': season, 'lease': lease_seconds, 'limit': limit,
+        })
+        players = cursor.fetchall()
+    conn.commit()
+    return players
+
+
+def complete(cursor, job_ids: list):
+    """A function to mark a batch of jobs done and their players loaded, in the caller's transaction.
+
+    Args:
+        cursor: A cursor of the transaction that wrote the jobs' rows
+        job_ids (list): The ids of the finished jobs
+
+    """
+
+    cursor.execute(complete_jobs, [list(job_ids)])
+    done = {}
+    for player, position, season, kind in cursor.fetchall():
+        done.setdefault(loaded_table(position, kind), []).append((player, season))
+    for table, players in done.items():
+        collector_sql.mark_loaded(cursor, table, players)
+
+
+def fail(conn, job_id: int, error: Exception, retry: bool = True) -> bool:
+    """A function to put a job back in the queue after an error, or give up on it.
+
+    Args:
+        conn: An open psycopg2 connection
+        job_id (int): The id of the job
+        error (Exception): What went wrong
+        retry (bool): Whether the error is worth another attempt; the job is given up on anyway after
+            FF_MAX_ATTEMPTS attempts (default = True)
+
+    Returns:
+        bool: True if the job went back in the queue
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(fail_job, {
+            'id': job_id, 'retry': retry, 'max_attempts': max_attempts,
+            'error': type(error).__name__ + ': ' + str(error),
+        })
+        row = cursor.fetchone()
+    conn.commit()
+    return row is not None and row[0] == 'pending'
+
+
+# helper function that puts jobs a collector claimed but never finished back in the queue (e.g. to resume a run)
+def release(conn, job_ids: list):
+    if job_ids:
+        with conn.cursor() as cursor:
+            cursor.execute(release_jobs, [list(job_ids)])
+        conn.commit()
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+
+# function that returns the NFL season in progress (or most recently played) on a given day
+def current_season(today: date = None) -> int:
+    """A function to find the NFL season a given day belongs to.
+
+    A season is labelled by the year it kicks off in, and its playoffs run into February of the following year,
+    so any day before March belongs to the previous year's season.
+
+    Args:
+        today (date): The day to check (default = today)
+
+    Returns:
+        int: The season the day belongs to
+
+    """
+
+    today = today or date.today()
+    if today.month < 3:
+        return today.year - 1
+    return today.year
+
+
+# helper function that tells whether a season is over and its pages can no longer change
+def is_completed_season(season: int, today: date = None) -> bool:
+    return season < current_season(today)
+
+
+# helper function that returns the number of regular season weeks in a season (18 since 2021)
+def regular_season_weeks(season: int) -> int:
+    return 18 if season >= 2021 else 17
+
+
+# helper function that returns the day a season's first game is played: the Thursday after Labor Day
+def kickoff(season: int) -> date:
+    labor_day = date(season, 9, 1) + timedelta(days=(7 - date(season, 9, 1).weekday()) % 7)
+    return labor_day + timedelta(days=3)
+
+
+def latest_completed_week(season: int, today: date = None) -> int:
+    """A function to find the last regular season week of a season whose games have all been played.
+
+    A week's games run from Thursday to Monday night, so a week counts as completed from the Tuesday after it.
+
+    Args:
+        season (int): The season to check
+        today (date): The day to check (default = today)
+
+    Returns:
+        int: The latest completed week, 0 before the season's first week is over
+
+    """
+
+    today = today or date.today()
+    if is_completed_season(season, today):
+        return regular_season_weeks(season)
+    days = (today - kickoff(season)).days
+    if days < 5:
+        return 0
+    return min((days - 5) // 7 + 1, regular_season_weeks(season))
+
+
+# helper function that turns '2019-2023' or '2019,2021' into a list of seasons
+def parse_seasons(text: str) -> list:
+    seasons = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            seasons.extend(range(int(first), int(last) + 1))
+        else:
+            seasons.append(int(part))
+    return seasons
@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd  # type: ignore
+
+import html_parser
+from game_log_schema import build_frame, extract_columns
+
+# number of parser processes; 0 parses on the calling thread
+default_workers = int(os.environ.get('FF_PARSE_WORKERS', 0))
+
+_pool = None
+_pool_workers = default_workers
+_pool_lock = threading.Lock()
+
+
+def parse_columns(html, position: str, kind: str, table_id: str = None, index: int = 0) -> dict:
+    """A function to parse a game log page into the schema's column arrays. Runs in a parser process.
+
+    Args:
+        html (bytes): The page, as raw bytes (or text)
+        position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+        kind (str): 'basic' or 'advanced'
+        table_id (str): The id of the table to read (default = the table at `index`)
+        index (int): The position of the table on the page, used when no id is given (default = 0)
+
+    Returns:
+        dict: df column -> (values, null mask, pandas dtype), see game_log_schema.extract_columns
+
+    """
+
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    return extract_columns(html_parser.table_rows(html, table_id, index), position, kind)
+
+
+class ParsePool:
+    """A pool of processes that parse game log pages, so parsing isn't serialized by the GIL.
+
+    Pages go to the workers as raw bytes and come back as the schema's compact column arrays (numpy buffers and null
+    masks), which are much cheaper to send between processes than parsed trees or DataFrames; the DataFrame is built
+    on the calling side. Workers are started with `spawn`, which is safe from a process that already runs threads.
+
+    Args:
+        workers (int): The number of parser processes (0 = parse on the calling thread)
+
+    """
+
+    def __init__(self, workers: int = default_workers):
+        self.workers = workers
+        self.executor = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, html, position: str, kind: str, table_id: str = None, index: int = 0):
+        """A function to start parsing a page.
+
+        Returns:
+            concurrent.futures.Future: The future of the page's column arrays (see parse_columns)
+
+        """
+
+        return self.executor.submit(parse_columns, html, position, kind, table_id, index)
+
+    def parse(self, html, position: str, kind: str, table_id: str = None, index: int = 0) -> pd.DataFrame:
+        """A function to parse a page into a game log DataFrame, in a parser process if the pool has any.
+
+        Args:
+            html (bytes): The page, as raw bytes (or text)
+            position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+            kind (str): 'basic' or 'advanced'
+            table_id (str): The id of the table to read (default = the table at `index`)
+            index (int): The position of the table on the page, used when no id is given (default = 0)
+
+        Returns:
+            pandas.DataFrame: Each game is a row of the DataFrame
+
+        """
+
+        if self.executor is None:
+            return build_frame(parse_columns(html, position, kind, table_id, index))
+        return build_frame(self.submit(html, position, kind, table_id, index).result())
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+# helper function that returns the pool shared by every scraper, starting it on first use
+def get_pool() -> ParsePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(_pool_workers)
+        return _pool
+
+
+# helper function that changes the number of parser processes (e.g. from a collector's settings)
+def configure(workers: int):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool.workers != workers:
+            _pool.shutdown()
+            _pool = None
+        _pool_workers = workers
+
+
+# helper function that parses a page with the shared pool
+def parse(html, position: str, kind: str, table_id: str = None, index: int = 0) -> pd.DataFrame:
+    return get_pool().parse(html, position, kind, table_id, index)
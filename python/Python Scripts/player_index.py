@@ -0,0 +1,180 @@
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+import html_parser
+import http_cache
+from http_session import fetch
+
+# index settings, can be overridden through the environment
+index_dir = os.environ.get('FF_PLAYER_INDEX_DIR', os.path.join(os.path.dirname(http_cache.cache_dir), 'players'))
+index_ttl = float(os.environ.get('FF_PLAYER_INDEX_TTL', 7 * 24 * 60 * 60))  # one week, in seconds
+
+# suffixes that Pro Football Reference is inconsistent about
+name_suffixes = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# letter -> {'built_at': float, 'players': {'name|position': [[first_season, last_season, href], ...]}}
+_indexes = {}
+_indexes_lock = threading.Lock()  # guards the two dicts, never held over a request
+_letter_locks = {}  # letter -> lock held while that letter's index is built
+
+
+# helper function that normalizes a player's name so lookups ignore case, punctuation and suffixes
+def normalize_name(name: str) -> str:
+    name = re.sub(r"[.,]", '', name.lower())
+    words = [word for word in name.split() if word not in name_suffixes]
+    return ' '.join(words)
+
+
+# helper function that returns the letter of the player-list page a player is found on
+def last_initial(player: str) -> str:
+    return player.split(' ')[1][0].upper()
+
+
+# helper function that makes a HTTP request over a list of players with a given last initial
+def make_request_list(letter: str, session: requests.Session = None):
+    url = 'https://www.pro-football-reference.com/players/%s/' % (letter)
+    return fetch(url, session)
+
+
+# helper function that parses a player-list page into an index
+def build_index(player_list: BeautifulSoup) -> dict:
+    players = {}
+    for p in player_list.find('div', id='div_players').find_all('p'):
+        link = p.find('a')
+        if link is None:
+            continue
+        text = p.text
+        seasons = text.split(' ')[-1].split('-')
+        try:
+            first, last = int(seasons[0]), int(seasons[-1])
+        except ValueError:
+            continue
+        match = re.search(r'\(([^)]*)\)', text)
+        positions = re.split(r'[-,/ ]+', match.group(1)) if match else []
+        href = link.get('href').replace('.htm', '')
+        for position in positions:
+            key = normalize_name(link.text) + '|' + position
+            players.setdefault(key, []).append([first, last, href])
+    return {'built_at': time.time(), 'players': players}
+
+
+# helper function that returns the path an index is persisted to
+def index_path(letter: str) -> str:
+    return os.path.join(index_dir, letter + '.json')
+
+
+# helper function that reads a persisted index, if it exists and has not expired
+def load_index(letter: str):
+    try:
+        with open(index_path(letter), 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - index['built_at'] > index_ttl:
+        return None
+    return index
+
+
+# helper function that persists an index to disk
+def save_index(letter: str, index: dict):
+    os.makedirs(index_dir, exist_ok=True)
+    path = index_path(letter)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(index, f)
+    os.replace(path + '.tmp', path)
+
+
+def get_index(letter: str, session: requests.Session = None, refresh: bool = False) -> dict:
+    """A function to retrieve the player-directory index for a given last initial.
+
+    The index is built once per letter from the Pro Football Reference player list, kept in memory and
+    persisted to disk, and only rebuilt once it is older than the index TTL.
+
+    Args:
+        letter (str): The last initial of the players in the index
+        session (requests.Session): The HTTP session to make requests with (default = shared session)
+        refresh (bool): Whether to rebuild the index even if it has not expired (default = False)
+
+    Returns:
+        dict: The index, mapping 'normalized name|position' to a list of [first season, last season, href]
+
+    """
+
+    letter = letter.upper()
+    requested_at = time.time()
+    with _indexes_lock:
+        index = _indexes.get(letter)
+        letter_lock = _letter_locks.setdefault(letter, threading.Lock())
+    if not refresh and index and requested_at - index['built_at'] <= index_ttl:
+        return index
+
+    # only lookups of the same letter wait for the page; other letters are served meanwhile
+    with letter_lock:
+        with _indexes_lock:
+            index = _indexes.get(letter)
+        # another thread may have built it while this one was waiting
+        if index and (index['built_at'] >= requested_at or (not refresh and time.time() - index['built_at'] <= index_ttl)):
+            return index
+
+        index = None if refresh else load_index(letter)
+        if index is None:
+            r = make_request_list(letter, session)
+            index = build_index(html_parser.get_soup(r.text, 'div'))
+            save_index(letter, index)
+        with _indexes_lock:
+            _indexes[letter] = index
+        return index
+
+
+# helper function that searches an index for a player who played a given position in a given season
+def search_index(index: dict, player: str, positions: list, season: int):
+    name = normalize_name(player)
+    for position in positions:
+        for first, last, href in index['players'].get(name + '|' + position, []):
+            if first <= season <= last:
+                return href
+
+    # fall back to a partial name match, like the original player-list scan
+    for key, entries in index['players'].items():
+        key_name, key_position = key.split('|')
+        if key_position in positions and name in key_name:
+            for first, last, href in entries:
+                if first <= season <= last:
+                    return href
+    return None
+
+
+def find_href(player: str, position: str, season: int, alt_positions: list = None,
+              session: requests.Session = None) -> str:
+    """A function to find a player's Pro Football Reference href.
+
+    Args:
+        player (str): A NFL player's full name, as it appears on Pro Football Reference
+        position (str): The position the player plays
+        season (int): A season the player played in
+        alt_positions (list): Other positions the player may be listed under (e.g. 'FB' for a 'RB')
+        session (requests.Session): The HTTP session to make requests with (default = shared session)
+
+    Returns:
+        str: The player's href (e.g. /players/J/JeffJu00)
+
+    """
+
+    positions = [position] + (alt_positions or [])
+    letter = last_initial(player)
+    index = get_index(letter, session)
+    href = search_index(index, player, positions, season)
+
+    # player may be newer than the index, so rebuild it once before giving up
+    if href is None and time.time() - index['built_at'] > 60:
+        href = search_index(get_index(letter, session, refresh=True), player, positions, season)
+
+    if href is None:
+        raise Exception('Cannot find a ' + position + ' named ' + player + ' from ' + str(season))
+    return href
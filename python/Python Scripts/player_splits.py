@@ -1,8 +1,18 @@
-from pro_football_reference_web_scraper import player_game_log as p
 import pandas as pd
+from sqlalchemy import text
 
+import db
+import player_game_log as p
 
-def home_road(player: str, position: str, season: int, avg=True) -> pd.DataFrame:
+# game log upload table of each position (TEs are collected with the WRs)
+upload_tables = {'QB': 'profootball_qb_upload', 'RB': 'profootball_rb_upload', 'WR': 'profootball_wr_upload',
+                 'TE': 'profootball_wr_upload'}
+
+# split name -> game log column the games are grouped by
+splits = {'home_road': 'game_location', 'win_loss': 'result'}
+
+
+def home_road(player: str, position: str, season: int, avg=True, source=None) -> pd.DataFrame:
     """A function that returns a player's home-road splits in a given season
 
     Returns a pandas DataFrame of a player's stats at home vs. on the road
@@ -12,13 +22,14 @@ def home_road(player: str, position: str, season: int, avg=True) -> pd.DataFrame
         position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
         season (int): The season of the stats you are trying to retrieve
         avg (bool): Whether you want the stats as averages or sums (default = True)
+        source: Where the game log comes from (default = scrape it), see load_game_log
 
     Returns:
         pandas.DataFrame: A pandas DataFrame of a player's home-road splits
 
     """
 
-    game_log = p.get_player_game_log(player, position, season)
+    game_log = load_game_log(player, position, season, source)
     game_log = format_game_log(game_log)  # get rid of extraneous stats
 
     if avg:
@@ -31,7 +42,7 @@ def home_road(player: str, position: str, season: int, avg=True) -> pd.DataFrame
         return splits_sum(game_log, 'game_location')
 
 
-def win_loss(player: str, position: str, season: int, avg=True) -> pd.DataFrame:
+def win_loss(player: str, position: str, season: int, avg=True, source=None) -> pd.DataFrame:
     """A function that returns a player's win-loss splits in a given season
 
     Returns a pandas DataFrame of a player's stats in wins vs. in losses
@@ -41,13 +52,14 @@ def win_loss(player: str, position: str, season: int, avg=True) -> pd.DataFrame:
         position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
         season (int): The season of the stats you are trying to retrieve
         avg (bool): Whether you want the stats as averages or sums
+        source: Where the game log comes from (default = scrape it), see load_game_log
 
     Returns:
         pandas.DataFrame: A pandas DataFrame of a player's win-loss splits
 
     """
 
-    game_log = p.get_player_game_log(player, position, season)
+    game_log = load_game_log(player, position, season, source)
     game_log = format_game_log(game_log)
 
     if avg:
@@ -60,6 +72,79 @@ def win_loss(player: str, position: str, season: int, avg=True) -> pd.DataFrame:
         return splits_sum(game_log, 'result')
 
 
+def season_splits(position: str, season: int, split: str = 'home_road', avg=True, source='db') -> pd.DataFrame:
+    """A function that returns the splits of every player of a position in a given season
+
+    Returns a pandas DataFrame of every player's stats per split, computed in one grouped pass over all their games
+
+    Args:
+        position (str): The position the players play. Must be 'QB', 'RB', 'WR', or 'TE'
+        season (int): The season of the stats you are trying to retrieve
+        split (str): 'home_road' or 'win_loss' (default = 'home_road')
+        avg (bool): Whether you want the stats as averages or sums (default = True)
+        source: 'db' to read the position's uploaded game logs with one query (default), or a DataFrame of game logs
+            with a 'name' column
+
+    Returns:
+        pandas.DataFrame: A pandas DataFrame of splits, indexed by player name and split
+
+    """
+
+    if isinstance(source, pd.DataFrame):
+        game_logs = source
+    else:
+        game_logs = read_game_logs(position, season)
+    game_logs = format_game_log(game_logs.drop(columns=['year'], errors='ignore'))
+
+    if avg:
+        return splits_averages(game_logs, ['name', splits[split]])
+
+    # doesn't make sense to sum snap pct
+    if position == 'WR' or position == 'TE':
+        game_logs = game_logs.drop('snap_pct', axis=1)
+    return splits_sum(game_logs, ['name', splits[split]])
+
+
+def load_game_log(player: str, position: str, season: int, source=None) -> pd.DataFrame:
+    """A function that returns a player's game log in a given season from the given source
+
+    Args:
+        player (str): A NFL player's full name, as it appears on Pro Football Reference
+        position (str): The position the player plays. Must be 'QB', 'RB', 'WR', or 'TE'
+        season (int): The season of the game log
+        source: None to scrape the game log, a DataFrame of an already loaded game log, 'db' to read it from the
+            position's upload table, or a dict used as a cache: the game log is scraped the first time it is asked
+            for and reused after that (default = None)
+
+    Returns:
+        pandas.DataFrame: Each game is a row of the DataFrame
+
+    """
+
+    if isinstance(source, pd.DataFrame):
+        return source.copy()
+    if source == 'db':
+        return read_game_logs(position, season, player).drop(columns=['name', 'year'])
+    if isinstance(source, dict):
+        key = (player, position, season)
+        if key not in source:
+            source[key] = load_game_log(player, position, season)
+        return source[key].copy()
+    game_log, _ = p.get_player_game_log(player, position, season)
+    return game_log
+
+
+# helper function that reads a position-season's game logs (or one player's) from its upload table in one query
+def read_game_logs(position: str, season: int, player: str = None) -> pd.DataFrame:
+    query = 'SELECT * FROM ' + upload_tables[position] + ' WHERE year = :season'
+    params = {'season': season}
+    if player:
+        query += ' AND name = :name'
+        params['name'] = player
+    with db.get_engine().connect() as conn:
+        return pd.read_sql(text(query + ' ORDER BY name, date'), conn, params=params)
+
+
 # helper function to properly format game log for grouping
 def format_game_log(game_log: pd.DataFrame) -> pd.DataFrame:
     game_log['game_location'] = game_log['game_location'].replace('', 'home')
@@ -69,17 +154,24 @@ def format_game_log(game_log: pd.DataFrame) -> pd.DataFrame:
 
 
 # helper function to group a game log and return its averages
-def splits_averages(game_log: pd.DataFrame, grouping: str):
+def splits_averages(game_log: pd.DataFrame, grouping):
     # count number of games for each split
     counts = game_log.groupby(grouping).size().to_frame('games')
     game_log = game_log.groupby(grouping).mean(numeric_only=True)
     game_log.insert(0, 'games', counts['games'])
-    return game_log.iloc[::-1]
+    return order_splits(game_log)
 
 
-def splits_sum(game_log: pd.DataFrame, grouping: str):
+def splits_sum(game_log: pd.DataFrame, grouping):
     # count number of games for each split
     counts = game_log.groupby(grouping).size().to_frame('games')
     game_log = game_log.groupby(grouping).sum(numeric_only=True)
     game_log.insert(0, 'games', counts['games'])
-    return game_log.iloc[::-1]
+    return order_splits(game_log)
+
+
+# helper function that lists the splits in reverse order (home before away, W before L), per player if grouped by one
+def order_splits(splits_df: pd.DataFrame) -> pd.DataFrame:
+    if splits_df.index.nlevels > 1:
+        return splits_df.sort_index(level=[0, 1], ascending=[True, False])
+    return splits_df.iloc[::-1]
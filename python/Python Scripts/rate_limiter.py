@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Sports Reference asks bots to stay under 20 requests per minute
+requests_per_minute = float(os.environ.get('FF_REQUESTS_PER_MINUTE', 20))
+min_requests_per_minute = float(os.environ.get('FF_MIN_REQUESTS_PER_MINUTE', 2))
+burst = float(os.environ.get('FF_REQUEST_BURST', 1))
+
+# AIMD policy: every successful request adds a little budget back, every throttled one halves it
+increase_per_success = 0.5  # requests per minute
+decrease_factor = 0.5
+default_retry_after = 60.0  # seconds, when the site throttles without saying for how long
+
+
+class RateLimitedError(Exception):
+    """Raised when the site keeps answering HTTP 429 / 503 after every retry."""
+
+
+class TokenBucket:
+    """A thread-safe token bucket that spaces requests out to a fixed rate.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every request takes one token,
+    waiting for it if the bucket is empty.
+
+    Args:
+        rate (float): The number of tokens added per second
+        capacity (float): The maximum number of tokens the bucket holds (the allowed burst)
+
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    # helper function that adds the tokens earned since the last update
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """A function to take a token, blocking until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting
+
+        """
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    # helper function that stops handing out tokens for a given number of seconds
+    def block(self, seconds: float):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.updated = time.monotonic()
+
+
+class AdaptiveRateLimiter:
+    """A per-host rate limiter that adapts its request budget to how the site responds.
+
+    Each host gets its own token bucket. The budget grows additively while responses succeed, up to the
+    ceiling, and is cut multiplicatively when the site answers HTTP 429 / 503, at which point the host is
+    also paused for as long as its Retry-After header asks.
+
+    Args:
+        max_per_minute (float): The ceiling of the request budget, per host
+        min_per_minute (float): The floor of the request budget, per host
+        capacity (float): The allowed burst, per host
+
+    """
+
+    def __init__(self, max_per_minute: float, min_per_minute: float = min_requests_per_minute, capacity: float = 1):
+        self.max_per_minute = max_per_minute
+        self.min_per_minute = min(min_per_minute, max_per_minute)
+        self.capacity = capacity
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    # helper function that returns a host's bucket, creating it at the full budget
+    def _bucket(self, host: str) -> TokenBucket:
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.max_per_minute / 60, self.capacity)
+                self.stats[host] = {'requests': 0, 'throttled': 0, 'waited': 0.0}
+            return self.buckets[host]
+
+    def acquire(self, host: str) -> float:
+        """A function to wait for the budget to make one request to a host.
+
+        Args:
+            host (str): The host the request goes to
+
+        Returns:
+            float: The number of seconds spent waiting
+
+        """
+
+        waited = self._bucket(host).acquire()
+        with self.lock:
+            self.stats[host]['requests'] += 1
+            self.stats[host]['waited'] += waited
+        return waited
+
+    def record(self, host: str, status_code: int, retry_after: str = None):
+        """A function to adapt a host's budget to the response of a request.
+
+        Args:
+            host (str): The host the request went to
+            status_code (int): The HTTP status of the response
+            retry_after (str): The response's Retry-After header, if any
+
+        """
+
+        bucket = self._bucket(host)
+        if status_code in (429, 503):
+            with bucket.lock:
+                bucket.rate = max(self.min_per_minute / 60, bucket.rate * decrease_factor)
+            with self.lock:
+                self.stats[host]['throttled'] += 1
+            bucket.block(parse_retry_after(retry_after))
+        elif status_code < 500:
+            with bucket.lock:
+                bucket.rate = min(self.max_per_minute / 60, bucket.rate + increase_per_success / 60)
+
+    # helper function that returns a host's current budget, in requests per minute
+    def current_rate(self, host: str) -> float:
+        return self._bucket(host).rate * 60
+
+    def metrics(self) -> dict:
+        """A function to report every host's current budget and counters.
+
+        Returns:
+            dict: host -> {'rate': requests per minute, 'requests', 'throttled', 'waited': seconds}
+
+        """
+
+        with self.lock:
+            return {
+                host: dict(self.stats[host], waited=round(self.stats[host]['waited'], 2), rate=round(bucket.rate * 60, 2))
+                for host, bucket in self.buckets.items()
+            }
+
+
+# helper function that turns a Retry-After header (seconds or HTTP date) into seconds
+def parse_retry_after(value: str) -> float:
+    if not value:
+        return default_retry_after
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default_retry_after
+
+
+_limiter = AdaptiveRateLimiter(requests_per_minute, capacity=burst)
+
+
+# helper function that returns the limiter shared by every request to the site
+def get_limiter() -> AdaptiveRateLimiter:
+    return _limiter
+
+
+# helper function that changes the shared request budget ceiling (e.g. from a collector's settings)
+def configure(per_minute: float, capacity: float = None):
+    with _limiter.lock:
+        _limiter.max_per_minute = per_minute
+        _limiter.min_per_minute = min(_limiter.min_per_minute, per_minute)
+        if capacity is not None:
+            _limiter.capacity = capacity
+        buckets = list(_limiter.buckets.values())
+    for bucket in buckets:
+        with bucket.lock:
+            bucket.rate = min(bucket.rate, per_minute / 60)
+            if capacity is not None:
+                bucket.capacity = capacity
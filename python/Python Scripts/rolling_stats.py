@@ -0,0 +1,283 @@
+import argparse
+import sys
+
+import pandas as pd  # type: ignore
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from sqlalchemy import text
+
+import bulk_loader
+import db
+import job_queue
+
+table = 'rolling_stats'
+key_columns = ['name', 'year', 'week', 'position']
+positions = ['RB', 'WR']  # TEs are uploaded with the WRs
+
+# stat -> pandas dtype; tgt and snap_pct come from the basic game logs, air_yds and yac from the advanced ones
+stats = {'tgt': 'Int64', 'snap_pct': 'Float64', 'air_yds': 'Int64', 'yac': 'Int64'}
+advanced_stats = {'RB': [], 'WR': ['air_yds', 'yac']}  # RB advanced game logs have no air yards
+windows = [3, 5, 8]  # trailing games
+
+sql_types = {'Int64': 'integer', 'Float64': 'double precision'}
+create_table = (
+    'CREATE TABLE IF NOT EXISTS rolling_stats (\n'
+    '    name text NOT NULL,\n'
+    '    year integer NOT NULL,\n'
+    '    week integer NOT NULL,\n'
+    '    position text NOT NULL,\n'
+    '    season_games integer NOT NULL,\n'
+    + ''.join('    ' + stat + ' ' + sql_types[dtype] + ',\n' for stat, dtype in stats.items())
+    + ''.join('    ' + stat + '_std double precision,\n' for stat in stats)
+    + ''.join('    ' + stat + '_avg' + str(n) + ' double precision,\n' for n in windows for stat in stats)
+    + '    PRIMARY KEY (name, year, week, position)\n'
+    ');\n'
+)
+
+# a player's played games, with the advanced stats joined on by week
+source_rows = """
+SELECT b.name, b.year, b.week, b.tgt, b.snap_pct, {} AS air_yds, {} AS yac
+FROM {} b {}
+WHERE b.inactive IS NOT TRUE AND b.week IS NOT NULL AND ({}::text[] IS NULL OR b.name = ANY({}::text[]))
+"""
+
+# the first game of each player whose stats are new or differ from the ones the store was computed from
+first_changed = """
+WITH source AS ({})
+SELECT s.name, min(s.year * 100 + s.week)
+FROM source s
+LEFT JOIN rolling_stats r ON r.position = {} AND r.name = s.name AND r.year = s.year AND r.week = s.week
+WHERE r.name IS NULL
+   OR (s.tgt, s.snap_pct, s.air_yds, s.yac) IS DISTINCT FROM (r.tgt, r.snap_pct, r.air_yds, r.yac)
+GROUP BY s.name
+"""
+
+# the stored games the changed windows still reach back to: the games of the same season, and enough before them
+# to fill the longest trailing window
+context_rows = """
+SELECT name, year, week, tgt, snap_pct, air_yds, yac FROM (
+    SELECT r.name, r.year, r.week, r.tgt, r.snap_pct, r.air_yds, r.yac, v.start,
+           row_number() OVER (PARTITION BY r.name ORDER BY r.year DESC, r.week DESC) AS games_back
+    FROM rolling_stats r JOIN (VALUES %s) AS v (name, start) ON r.name = v.name
+    WHERE r.position = {} AND r.year * 100 + r.week < v.start
+) context
+WHERE games_back < {} OR year = start / 100
+"""
+
+# the games from each player's first changed game on
+changed_rows = """
+WITH source AS ({})
+SELECT s.* FROM source s JOIN (VALUES %s) AS v (name, start) ON s.name = v.name
+WHERE s.year * 100 + s.week >= v.start
+"""
+
+latest_rows = """
+SELECT DISTINCT ON (name) * FROM rolling_stats
+WHERE position = :position AND (CAST(:season AS integer) IS NULL OR (year = :season AND week <= :week))
+ORDER BY name, year DESC, week DESC
+"""
+
+
+# helper function that builds the query of a position's games, of some players or of every player
+def source_query(position: str, players: list = None) -> sql.Composed:
+    advanced = advanced_stats[position]
+    if advanced:
+        join = sql.SQL('LEFT JOIN {} a ON a.name = b.name AND a.year = b.year AND a.week = b.week').format(
+            sql.Identifier(job_queue.upload_table(position, 'advanced'))
+        )
+    else:
+        join = sql.SQL('')
+    return sql.SQL(source_rows).format(
+        sql.SQL('a.air_yds' if 'air_yds' in advanced else 'NULL::integer'),
+        sql.SQL('a.yac' if 'yac' in advanced else 'NULL::integer'),
+        sql.Identifier(job_queue.upload_table(position, 'basic')), join,
+        sql.Literal(players), sql.Literal(players),
+    )
+
+
+# helper function that reads a query's rows into a DataFrame
+def fetch_frame(cursor) -> pd.DataFrame:
+    return pd.DataFrame(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+
+def compute(games: pd.DataFrame) -> pd.DataFrame:
+    """A function to compute the season-to-date and trailing averages of every game of some players' game logs.
+
+    Trailing windows run across seasons, so a player's first games of a season average in the end of the last one.
+    Games without a stat (e.g. no advanced game log) are left out of that stat's averages.
+
+    Args:
+        games (pandas.DataFrame): The players' played games: name, year, week and the stats
+
+    Returns:
+        pandas.DataFrame: One row per game with its stats, '<stat>_std' season-to-date averages and
+            '<stat>_avg<n>' averages of the player's last n games (up to and including that one)
+
+    """
+
+    games = games.sort_values(['name', 'year', 'week'], ignore_index=True)
+    values = games[list(stats)].apply(pd.to_numeric).astype('float64')
+    season = [games['name'], games['year']]
+
+    df = games[['name', 'year', 'week']].copy()
+    df['season_games'] = games.groupby(season).cumcount() + 1
+    for stat, dtype in stats.items():
+        df[stat] = values[stat].astype(dtype)
+
+    totals = values.fillna(0).groupby(season).cumsum()
+    counts = values.notna().astype('int64').groupby(season).cumsum()
+    averages = totals / counts.where(counts > 0)
+    for stat in stats:
+        df[stat + '_std'] = averages[stat]
+
+    # a trailing window's total is the player's running total minus the running total n games earlier
+    player = games['name']
+    running_totals = values.fillna(0).groupby(player).cumsum()
+    running_counts = values.notna().astype('int64').groupby(player).cumsum()
+    for n in windows:
+        totals = running_totals - running_totals.groupby(player).shift(n).fillna(0)
+        counts = running_counts - running_counts.groupby(player).shift(n).fillna(0)
+        averages = totals / counts.where(counts > 0)
+        for stat in stats:
+            df[stat + '_avg' + str(n)] = averages[stat]
+    return df
+
+
+def ensure_table(conn):
+    """A function to create the rolling stats table if it doesn't exist yet.
+
+    Args:
+        conn: An open psycopg2 connection
+
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(create_table)
+    conn.commit()
+    bulk_loader.ensure_versions_table(conn)
+
+
+def update(cursor, position: str, players: list = None) -> int:
+    """A function to bring the rolling stats of some players up to date with their game logs, in the caller's
+    transaction.
+
+    Only the windows that changed are recomputed: each player's games are compared with the stats the store was
+    computed from, and from the first new or corrected game on, the player's rows are recomputed from those games
+    plus the stored games their windows reach back to (the rest of that season and the 7 games before).
+
+    Args:
+        cursor: A cursor of the transaction that wrote the game logs
+        position (str): The position the players play. Must be 'RB' or 'WR'
+        players (list): The players' names (default = every player)
+
+    Returns:
+        int: The number of games recomputed
+
+    """
+
+    if players is not None and not players:
+        return 0
+    source = source_query(position, players)
+    cursor.execute(sql.SQL(first_changed).format(source, sql.Literal(position)))
+    starts = cursor.fetchall()
+    if not starts:
+        return 0
+
+    context_query = sql.SQL(context_rows).format(sql.Literal(position), sql.Literal(max(windows)))
+    execute_values(cursor, context_query.as_string(cursor), starts, page_size=len(starts))
+    context = fetch_frame(cursor)
+    execute_values(cursor, sql.SQL(changed_rows).format(source).as_string(cursor), starts, page_size=len(starts))
+    changed = fetch_frame(cursor)
+
+    df = compute(pd.concat([context, changed], ignore_index=True))
+    start = df['name'].map(dict(starts))
+    df = df[df['year'] * 100 + df['week'] >= start].assign(position=position)
+    return bulk_loader.load_frames(cursor.connection, [df], table, key_columns)
+
+
+def refresh(conn, position: str, players: list = None) -> int:
+    """A function to update and commit the rolling stats of a position (e.g. to build the table the first time).
+
+    Args:
+        conn: An open psycopg2 connection
+        position (str): The position the players play. Must be 'RB' or 'WR'
+        players (list): The players' names (default = every player)
+
+    Returns:
+        int: The number of games recomputed
+
+    """
+
+    try:
+        with conn.cursor() as cursor:
+            rows = update(cursor, position, players)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    sys.stdout.write('recomputed rolling stats of ' + str(rows) + ' ' + position + ' games' + '\n')
+    return rows
+
+
+def latest(position: str, season: int = None, week: int = None) -> pd.DataFrame:
+    """A function to return every player's most recent season-to-date and trailing averages, e.g. for rankings.
+
+    With a season, only players who played in it are returned, as of their last game of it (up to `week`), so the
+    season-to-date columns are always that season's. Their trailing averages still reach back into earlier seasons.
+
+    Args:
+        position (str): The position the players play. Must be 'RB' or 'WR'
+        season (int): The season to look at (default = each player's latest game, whatever its season)
+        week (int): Only games up to this week of the season count (default = the whole season); needs a season
+
+    Returns:
+        pandas.DataFrame: One row per player, as of their last game
+
+    """
+
+    if week is not None and season is None:
+        raise Exception('A week needs a season')
+    params = {'position': position, 'season': season, 'week': week if week is not None else 99}
+    with db.get_engine().connect() as conn:
+        return pd.read_sql(text(latest_rows), conn, params=params)
+
+
+def player_history(player: str, position: str, season: int = None) -> pd.DataFrame:
+    """A function to return a player's rolling stats after every game.
+
+    Args:
+        player (str): The player's name, as it appears in the game log tables
+        position (str): The position the player plays. Must be 'RB' or 'WR'
+        season (int): The season to return (default = every season)
+
+    Returns:
+        pandas.DataFrame: One row per game
+
+    """
+
+    query = 'SELECT * FROM rolling_stats WHERE name = :name AND position = :position'
+    params = {'name': player, 'position': position}
+    if season:
+        query += ' AND year = :season'
+        params['season'] = season
+    with db.get_engine().connect() as conn:
+        return pd.read_sql(text(query + ' ORDER BY year, week'), conn, params=params)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description='Update the rolling stats table from the uploaded game logs.')
+    parser.add_argument('--position', nargs='+', choices=positions, type=str.upper, default=positions,
+                        help='the positions to update (default: all)')
+    args = parser.parse_args(argv)
+
+    conn = db.raw_connection()
+    try:
+        ensure_table(conn)
+        for position in args.position:
+            refresh(conn, position)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
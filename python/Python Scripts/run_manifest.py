@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+import rate_limiter
+
+manifest_dir = os.environ.get('FF_RUN_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'runs'))
+
+# player statuses
+ATTEMPTED = 'attempted'  # claimed, not finished yet
+SUCCEEDED = 'succeeded'
+RETRYING = 'retrying'  # failed with a transient error, back in the queue
+FAILED = 'failed'
+
+# errors that are worth trying again later: the site or the network, not the player
+transient_errors = (requests.ConnectionError, requests.Timeout, rate_limiter.RateLimitedError)
+
+
+# helper function that tells whether an error is likely to go away on a later attempt
+def is_transient(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return isinstance(error, transient_errors)
+
+
+# helper function that returns a new run's id, e.g. '20231015-093000-4242'
+def new_run_id() -> str:
+    return time.strftime('%Y%m%d-%H%M%S') + '-' + str(os.getpid())
+
+
+# helper function that returns where a run's manifest is kept
+def manifest_path(run_id: str) -> str:
+    return os.path.join(manifest_dir, run_id + '.json')
+
+
+class RunManifest:
+    """The persisted record of a collection run: its arguments, and what happened to every player it claimed.
+
+    The manifest is rewritten atomically at every checkpoint, so an interrupted run can be resumed from it
+    (see `load`) without repeating the work it already finished.
+
+    Args:
+        run_id (str): The id of the run
+        args (dict): The arguments the run was started with, reused when it is resumed
+
+    """
+
+    def __init__(self, run_id: str, args: dict):
+        self.run_id = run_id
+        self.args = args
+        self.created_at = time.time()
+        self.combinations = {}  # 'WR basic 2023' -> {'enqueued': bool, 'finished': bool}
+        self.players = {}  # job id -> {'player', 'combination', 'status', 'attempts', 'error'}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, run_id: str) -> 'RunManifest':
+        """A function to read a run's manifest back from disk, to resume it.
+
+        Args:
+            run_id (str): The id of the run
+
+        Returns:
+            RunManifest: The run's manifest
+
+        """
+
+        path = manifest_path(run_id)
+        if not os.path.exists(path):
+            raise Exception('Cannot find run ' + run_id + ' in ' + manifest_dir)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        manifest = cls(data['run_id'], data['args'])
+        manifest.created_at = data['created_at']
+        manifest.combinations = data['combinations']
+        manifest.players = data['players']
+        return manifest
+
+    def save(self):
+        """A function to checkpoint the manifest to disk."""
+
+        with self.lock:
+            data = {
+                'run_id': self.run_id,
+                'args': self.args,
+                'created_at': self.created_at,
+                'updated_at': time.time(),
+                'summary': self._summary(),
+                'combinations': self.combinations,
+                'players': self.players,
+            }
+        os.makedirs(manifest_dir, exist_ok=True)
+        path = manifest_path(self.run_id)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(path + '.tmp', path)
+
+    # helper function that returns a combination's state, creating it
+    def combination(self, name: str) -> dict:
+        with self.lock:
+            return self.combinations.setdefault(name, {'enqueued': False, 'finished': False})
+
+    def attempted(self, job_id: int, player: str, combination: str):
+        """A function to record that a player's job was claimed by the run."""
+
+        with self.lock:
+            entry = self.players.setdefault(str(job_id), {
+                'player': player, 'combination': combination, 'attempts': 0, 'error': None,
+            })
+            entry['status'] = ATTEMPTED
+            entry['attempts'] += 1
+
+    def succeeded(self, job_ids: list):
+        """A function to record that a batch of players was loaded."""
+
+        with self.lock:
+            for job_id in job_ids:
+                self.players[str(job_id)].update(status=SUCCEEDED, error=None)
+
+    def failed(self, job_id: int, error: Exception, retrying: bool):
+        """A function to record that a player failed, and whether it went back in the queue."""
+
+        with self.lock:
+            self.players[str(job_id)].update(status=RETRYING if retrying else FAILED, error=type(error).__name__)
+
+    # helper function that returns the ids of the jobs the run claimed but never finished (e.g. when it was killed)
+    def unfinished(self, combination: str) -> list:
+        with self.lock:
+            return [int(job_id) for job_id, entry in self.players.items()
+                    if entry['combination'] == combination and entry['status'] == ATTEMPTED]
+
+    def _summary(self) -> dict:
+        summary = {'attempted': len(self.players), SUCCEEDED: 0, RETRYING: 0, FAILED: 0, 'errors': {}}
+        for entry in self.players.values():
+            if entry['status'] != ATTEMPTED:
+                summary[entry['status']] += 1
+            if entry['status'] == FAILED:
+                summary['errors'][entry['error']] = summary['errors'].get(entry['error'], 0) + 1
+        return summary
+
+    def summary(self) -> dict:
+        """A function to count the run's players by outcome.
+
+        Returns:
+            dict: {'attempted', 'succeeded', 'retrying', 'failed', 'errors': error class -> failed players}
+
+        """
+
+        with self.lock:
+            return self._summary()
@@ -0,0 +1,206 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd  # type: ignore
+from sqlalchemy import text
+
+import db
+
+cache_size = int(os.environ.get('FF_SPLIT_CACHE_SIZE', 128))  # results kept in memory
+aggregates = ('sum', 'mean', 'per_game')
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class Bin:
+    """A grouping key that buckets a numeric column, by fixed edges (pandas.cut) or into quantiles (pandas.qcut).
+
+    Timedelta columns (e.g. rest_days) are bucketed by their number of days.
+
+    Args:
+        column (str): The column to bucket
+        edges (list): The bucket edges, right-inclusive (e.g. [0, 6, 7, 13] for rest days)
+        quantiles (int): The number of equal-sized buckets to use instead of edges (e.g. 10 for deciles)
+        labels (list): The names of the buckets (default = the intervals)
+
+    """
+
+    def __init__(self, column: str, edges: list = None, quantiles: int = None, labels: list = None):
+        if (edges is None) == (quantiles is None):
+            raise Exception('A Bin needs either edges or quantiles')
+        self.column = column
+        self.edges = edges
+        self.quantiles = quantiles
+        self.labels = labels
+        self.name = column + ('_decile' if quantiles == 10 else '_bin')
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        values = df[self.column]
+        if pd.api.types.is_timedelta64_dtype(values):
+            values = values.dt.days
+        values = values.astype('float64')
+        if self.quantiles:
+            return pd.qcut(values, self.quantiles, labels=self.labels, duplicates='drop').rename(self.name)
+        return pd.cut(values, self.edges, labels=self.labels).rename(self.name)
+
+    def __repr__(self) -> str:
+        return 'Bin(%r, edges=%r, quantiles=%r, labels=%r)' % (self.column, self.edges, self.quantiles, self.labels)
+
+    # Bins with the same settings bucket the same way, so they are the same cache key
+    def _settings(self) -> tuple:
+        return (self.column, tuple(self.edges or ()), self.quantiles, tuple(self.labels or ()))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Bin) and self._settings() == other._settings()
+
+    def __hash__(self) -> int:
+        return hash(self._settings())
+
+
+# common binned keys
+rest_day_buckets = Bin('rest_days', edges=[0, 5, 7, 12, 365], labels=['short week', 'normal', 'extra rest', 'bye'])
+distance_deciles = Bin('distance_travelled', quantiles=10)
+season_quarters = Bin('week', edges=[0, 4, 9, 13, 18], labels=['weeks 1-4', 'weeks 5-9', 'weeks 10-13', 'weeks 14+'])
+
+
+# helper function that evaluates the grouping expressions: column names, Bins or functions of the DataFrame
+def group_keys(df: pd.DataFrame, by: list) -> list:
+    keys = []
+    for expression in by:
+        if isinstance(expression, str):
+            keys.append(df[expression])
+        else:
+            keys.append(expression(df))
+    return keys
+
+
+def aggregate(df: pd.DataFrame, by: list, how: tuple = aggregates, columns: list = None) -> pd.DataFrame:
+    """A function to compute split stats for any grouping in one grouped aggregation.
+
+    Args:
+        df (pandas.DataFrame): Game logs, e.g. every player of a position-season or many team-seasons
+        by (list): Grouping expressions: column names (e.g. 'name', 'opp', 'started'), Bins (e.g. rest_day_buckets),
+            or functions taking the DataFrame and returning a Series
+        how (tuple): Any of 'sum', 'mean' and 'per_game' (sum over the games played, inactive games excluded)
+        columns (list): The stats to aggregate (default = every numeric column that isn't grouped by)
+
+    Returns:
+        pandas.DataFrame: One row per group with its number of games, games played, and a '<stat>_<aggregate>'
+            column per stat and aggregate
+
+    """
+
+    by = [by] if isinstance(by, str) or callable(by) else list(by)
+    keys = group_keys(df, by)
+    key_names = {key.name for key in keys}
+    if columns is None:
+        columns = [column for column in df.select_dtypes(include=['number', 'bool'], exclude=['timedelta']).columns
+                   if column not in key_names and column not in ('year', 'season', 'week', 'inactive')]
+
+    stats = df[columns].astype('Float64')
+    played = ~df['inactive'].fillna(False).astype(bool) if 'inactive' in df.columns else pd.Series(True, index=df.index)
+    stats['games_played'] = played.astype('Float64')
+    grouped = stats.groupby(keys, observed=True, dropna=False)
+
+    totals = grouped.sum()
+    result = pd.DataFrame({'games': grouped.size(), 'games_played': totals.pop('games_played').astype('Int64')})
+    parts = [result]
+    if 'sum' in how:
+        parts.append(totals.add_suffix('_sum'))
+    if 'mean' in how:
+        parts.append(grouped[columns].mean().add_suffix('_mean'))
+    if 'per_game' in how:
+        parts.append(totals.div(result['games_played'].where(result['games_played'] > 0), axis=0).add_suffix('_per_game'))
+    return pd.concat(parts, axis=1)
+
+
+# helper function that returns a table's data version, bumped by every load committed through bulk_loader; None for
+# a table that was never loaded that way, whose results can't be cached
+def data_version(table: str) -> int:
+    with db.get_engine().connect() as conn:
+        if conn.execute(text("SELECT to_regclass('data_versions')")).scalar() is None:
+            return None
+        return conn.execute(text('SELECT version FROM data_versions WHERE table_name = :table'),
+                            {'table': table}).scalar()
+
+
+# helper function that reads the rows of a table matching column = value filters (a list value matches any of them)
+def read_table(table: str, where: dict = None) -> pd.DataFrame:
+    for identifier in [table] + list(where or {}):
+        if not identifier.isidentifier():
+            raise Exception('Invalid table or column name: ' + identifier)
+    clauses, params = [], {}
+    for i, (column, value) in enumerate((where or {}).items()):
+        if isinstance(value, (list, tuple)):
+            clauses.append('"%s" = ANY(:p%d)' % (column, i))
+            value = list(value)
+        else:
+            clauses.append('"%s" = :p%d' % (column, i))
+        params['p%d' % i] = value
+    query = 'SELECT * FROM ' + table + (' WHERE ' + ' AND '.join(clauses) if clauses else '')
+    with db.get_engine().connect() as conn:
+        return pd.read_sql(text(query), conn, params=params)
+
+
+def query(source, by: list, how: tuple = aggregates, columns: list = None, where: dict = None,
+          version=None) -> pd.DataFrame:
+    """A function to compute split stats over a stored table (or a DataFrame), caching the result.
+
+    Results are cached by the query and the version of the data it ran on (see bulk_loader's data_versions), so
+    asking again is free until a load into the table is committed. Tables without a version aren't cached. Bins are
+    cached by their settings, and functions used as grouping expressions by identity (the cache keeps them alive, so
+    a new function never reuses a cached one's key).
+
+    Args:
+        source: A game log table name (e.g. 'profootball_wr_upload') or a DataFrame of game logs
+        by (list): Grouping expressions, see aggregate
+        how (tuple): Any of 'sum', 'mean' and 'per_game', or one of them (default = all)
+        columns (list): The stats to aggregate (default = every numeric column that isn't grouped by)
+        where (dict): column -> value (or list of values) filters on the table's rows (e.g. {'year': 2023})
+        version: The version of a DataFrame source, e.g. ('wr_2023', 4), changed by the caller whenever its rows
+            change (default = a hash of its rows, which is a pass over the whole DataFrame)
+
+    Returns:
+        pandas.DataFrame: One row per group, see aggregate
+
+    """
+
+    if isinstance(source, pd.DataFrame):
+        source_key = ('frame', tuple(source.columns), tuple(str(dtype) for dtype in source.dtypes))
+        if version is None:
+            version = int(pd.util.hash_pandas_object(source, index=False).sum())
+    else:
+        source_key = source
+        version = data_version(source)
+    by_list = [by] if isinstance(by, str) or callable(by) else list(by)
+    how = (how,) if isinstance(how, str) else tuple(how)
+    key = (source_key, tuple(by_list), how, tuple(columns or ()), repr(sorted((where or {}).items())), version)
+
+    if version is None:
+        df = read_table(source, where)
+        return aggregate(df, by_list, how, columns)
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key].copy()
+
+    df = source if isinstance(source, pd.DataFrame) else read_table(source, where)
+    if isinstance(source, pd.DataFrame) and where:
+        for column, value in where.items():
+            df = df[df[column].isin(value if isinstance(value, (list, tuple)) else [value])]
+    result = aggregate(df, by_list, how, columns)
+
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    return result.copy()
+
+
+# helper function that empties the result cache
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
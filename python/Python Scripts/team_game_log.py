@@ -1,5 +1,7 @@
-from bs4 import BeautifulSoup
 import requests
+from http_session import fetch
+import html_parser
+import collection_engine
 import pandas as pd
 from datetime import date
 from haversine import haversine, Unit
@@ -141,7 +143,7 @@ cities = {
 
 
 # function that returns a team's game log in a given season
-def get_team_game_log(team: str, season: int) -> pd.DataFrame:
+def get_team_game_log(team: str, season: int, session: requests.Session = None) -> pd.DataFrame:
     """A function to retrieve a team's game log in a given season.
 
     Returns a pandas DataFrame of a NFL team's game log in a given season, including relevant team-level statistics.
@@ -149,6 +151,7 @@ def get_team_game_log(team: str, season: int) -> pd.DataFrame:
     Args:
         team (str): A NFL team's name, as it appears on Pro Football Reference
         season (int): The season of the game log you are trying to retrieve
+        session (requests.Session): The HTTP session to make requests with (default = shared session)
 
     Returns:
         pandas.DataFrame: Each game is a row of the DataFrame
@@ -160,29 +163,78 @@ def get_team_game_log(team: str, season: int) -> pd.DataFrame:
         raise Exception('Invalid team name. Note: spelling is case sensitive')
 
     # make HTTP request and extract HTML
-    r = make_request(team, season)
+    r = make_request(team, season, session)
 
     if r.status_code == 404:
         raise Exception('404 error. The ' + team + ' may not have existed in ' + str(season))
 
-    # parse HTML using BeautifulSoup
-    soup = get_soup(r)
+    # parse the rows of the games table
+    games = html_parser.table_rows(r.text, 'games')
 
     # collect data and return data frame
-    return collect_data(soup, season, team)
+    return collect_data(games, season, team)
 
 
-def make_request(team: str, season: int):
+def get_team_game_logs(teams: list, seasons: list, session: requests.Session = None,
+                       workers: int = collection_engine.default_workers) -> pd.DataFrame:
+    """A function to retrieve the game logs of many teams over many seasons at once.
+
+    Pages are fetched concurrently through the shared HTTP session, cache and rate limiter. Team-seasons that
+    don't exist (404, e.g. a franchise before it moved) are skipped.
+
+    Args:
+        teams (list): NFL teams' names, as they appear on Pro Football Reference
+        seasons (list): The seasons of the game logs you are trying to retrieve
+        session (requests.Session): The HTTP session to make requests with (default = shared session)
+        workers (int): The number of pages fetched at once
+
+    Returns:
+        pandas.DataFrame: One row per game, keyed by the 'team' and 'season' columns
+
+    """
+
+    for team in teams:
+        if team not in team_hrefs.keys():
+            raise Exception('Invalid team name: ' + team + '. Note: spelling is case sensitive')
+
+    def load(job):
+        team, season = job
+        r = make_request(team, season, session)
+        if r.status_code == 404:
+            return None
+        return collect_data(html_parser.table_rows(r.text, 'games'), season, team)
+
+    game_logs = {}
+
+    def write(job, game_log):
+        if game_log is not None:
+            game_logs[job] = game_log
+
+    jobs = [(team, season) for team in teams for season in seasons]
+    collection_engine.run(jobs, load, write, workers=workers)
+
+    # keep the requested order, whatever order the pages completed in
+    keys = [job for job in jobs if job in game_logs]
+    if not keys:
+        return pd.DataFrame()
+    df = pd.concat([game_logs[job] for job in keys], keys=keys, names=['team', 'season', None])
+    return df.reset_index(level=['team', 'season']).reset_index(drop=True)
+
+
+def make_request(team: str, season: int, session: requests.Session = None):
     url = 'https://www.pro-football-reference.com/teams/%s/%s.htm' % (team_hrefs[team], str(season))
-    return requests.get(url)
+    # a team-season that doesn't exist is a 404, handled by the callers
+    return fetch(url, session, season=season, allowed_statuses=(404,))
 
 
-def get_soup(request) -> BeautifulSoup:
-    return BeautifulSoup(request.text, 'html.parser')
+# helper function that turns a game date (e.g. 'September 12') into a date, January games being in the next year
+def game_date(text: str, season: int) -> date:
+    month, day = text.split(' ')
+    return date(season + 1 if month == 'January' else season, months[month], int(day))
 
 
-def collect_data(soup: BeautifulSoup, season: int, team: str) -> pd.DataFrame:
-    # set up data frame
+def collect_data(games: list, season: int, team: str) -> pd.DataFrame:
+    # set up columns, the data frame is built once at the end
     data = {
         'week': [],
         'day': [],
@@ -200,104 +252,55 @@ def collect_data(soup: BeautifulSoup, season: int, team: str) -> pd.DataFrame:
         'opp_pass_yds': [],
         'opp_rush_yds': [],
     }
-    df = pd.DataFrame(data)
-
-    # loading game data
-    games = soup.find_all('tbody')[1].find_all('tr')
 
     # remove playoff games
-    j = 0
-    while j < len(games) and games[j].find('td', {'data-stat': 'game_date'}).text != 'Playoffs':
-        j += 1
-    for k in range(j, len(games)):
-        games.pop()
-
-    # remove bye weeks
-    bye_weeks = []
     for j in range(len(games)):
-        if games[j].find('td', {'data-stat': 'opp'}).text == 'Bye Week':
-            bye_weeks.append(j)
-
-    if len(bye_weeks) > 1:
-        games.pop(bye_weeks[0])
-        games.pop(bye_weeks[1] - 1)
+        if games[j].get('game_date') == 'Playoffs':
+            games = games[:j]
+            break
 
-    elif len(bye_weeks) == 1:
-        games.pop(bye_weeks[0])
-
-    # remove canceled games
-    to_delete = []
-    for j in range(len(games)):
-        if games[j].find('td', {'data-stat': 'boxscore_word'}).text == 'canceled':
-            to_delete.append(j)
-    for k in to_delete:
-        games.pop(k)
+    # remove bye weeks and canceled games
+    games = [
+        game for game in games
+        if game.get('opp') != 'Bye Week' and game.get('boxscore_word') != 'canceled'
+    ]
 
     # gathering data
-    for i in range(len(games)):
-        week = int(games[i].find('th', {'data-stat': 'week_num'}).text)
-        day = games[i].find('td', {'data-stat': 'game_day_of_week'}).text
-        if i > 0:
-            if games[i - 1].find('td', {'data-stat': 'opp'}).text == 'Bye Week':
-                date1 = games[i - 2].find('td', {'data-stat': 'game_date'}).text.split(' ')
-                date2 = games[i].find('td', {'data-stat': 'game_date'}).text.split(' ')
-            else:
-                date1 = games[i - 1].find('td', {'data-stat': 'game_date'}).text.split(' ')
-                date2 = games[i].find('td', {'data-stat': 'game_date'}).text.split(' ')
-            if date1[0] == 'January':
-                rest_days = date(season + 1, months[date2[0]], int(date2[1])) - date(
-                    season + 1, months[date1[0]], int(date1[1])
-                )
-            elif date2[0] == 'January':
-                rest_days = date(season + 1, months[date2[0]], int(date2[1])) - date(
-                    season, months[date1[0]], int(date1[1])
-                )
-            else:
-                rest_days = date(season + 1, months[date2[0]], int(date2[1])) - date(
-                    season + 1, months[date1[0]], int(date1[1])
-                )
+    previous_date = None
+    for game in games:
+        current_date = game_date(game['game_date'], season)
+        if previous_date:
+            rest_days = current_date - previous_date
         else:
             rest_days = date(2022, 7, 11) - date(2022, 7, 1)  # setting first game as 10 rest days
+        previous_date = current_date
 
-        opp = games[i].find('td', {'data-stat': 'opp'}).text
+        opp = game['opp']
 
-        if games[i].find('td', {'data-stat': 'game_location'}).text == '@':
+        if game['game_location'] == '@':
             home_team = False
             distance_travelled = calculate_distance(locations[cities[team]], locations[cities[opp]])
         else:
             home_team = True
             distance_travelled = 0
 
-        result = games[i].find('td', {'data-stat': 'game_outcome'}).text
-        points_for = int(games[i].find('td', {'data-stat': 'pts_off'}).text)
-        points_allowed = int(games[i].find('td', {'data-stat': 'pts_def'}).text)
-        tot_yds = int(games[i].find('td', {'data-stat': 'yards_off'}).text)
-        pass_yds = int(games[i].find('td', {'data-stat': 'pass_yds_off'}).text)
-        rush_yds = int(games[i].find('td', {'data-stat': 'rush_yds_off'}).text)
-        opp_tot_yds = int(games[i].find('td', {'data-stat': 'yards_def'}).text)
-        opp_pass_yds = int(games[i].find('td', {'data-stat': 'pass_yds_def'}).text)
-        opp_rush_yds = int(games[i].find('td', {'data-stat': 'rush_yds_def'}).text)
-
-        # add row to data frame
-        df.loc[len(df.index)] = [
-            week,
-            day,
-            rest_days,
-            home_team,
-            distance_travelled,
-            opp,
-            result,
-            points_for,
-            points_allowed,
-            tot_yds,
-            pass_yds,
-            rush_yds,
-            opp_tot_yds,
-            opp_pass_yds,
-            opp_rush_yds,
-        ]
-
-    return df
+        data['week'].append(int(game['week_num']))
+        data['day'].append(game['game_day_of_week'])
+        data['rest_days'].append(rest_days)
+        data['home_team'].append(home_team)
+        data['distance_travelled'].append(distance_travelled)
+        data['opp'].append(opp)
+        data['result'].append(game['game_outcome'])
+        data['points_for'].append(int(game['pts_off']))
+        data['points_allowed'].append(int(game['pts_def']))
+        data['tot_yds'].append(int(game['yards_off']))
+        data['pass_yds'].append(int(game['pass_yds_off']))
+        data['rush_yds'].append(int(game['rush_yds_off']))
+        data['opp_tot_yds'].append(int(game['yards_def']))
+        data['opp_pass_yds'].append(int(game['pass_yds_def']))
+        data['opp_rush_yds'].append(int(game['rush_yds_def']))
+
+    return pd.DataFrame(data)
 
 
 def calculate_distance(city1: dict, city2: dict) -> float:
@@ -1,6 +1,10 @@
-from pro_football_reference_web_scraper import team_game_log as t
 import pandas as pd
 
+import team_game_log as t
+
+# split name -> game log column the games are grouped by
+splits = {'home_road': 'game_location', 'win_loss': 'result'}
+
 
 def home_road(team: str, season: int, avg=True) -> pd.DataFrame:
     """A function that returns a team's home-road splits in a given season
@@ -52,88 +56,70 @@ def win_loss(team: str, season: int, avg=True) -> pd.DataFrame:
         return splits_sum(game_log, 'result')
 
 
+def league_splits(teams: list, seasons: list, split: str = 'home_road', avg=True) -> pd.DataFrame:
+    """A function that returns the splits of many teams over many seasons at once
+
+    Returns a pandas DataFrame of every team-season's stats per split, computed in one grouped pass over all the games
+
+    Args:
+        teams (list): NFL teams' names, as they appear on Pro Football Reference
+        seasons (list): The seasons of the stats you are trying to retrieve
+        split (str): 'home_road' or 'win_loss' (default = 'home_road')
+        avg (bool): Whether you want the stats as averages or sums (default = True)
+
+    Returns:
+        pandas.DataFrame: A pandas DataFrame of splits, indexed by team, season and split
+
+    """
+
+    game_logs = format_game_log(t.get_team_game_logs(teams, seasons))
+    grouping = ['team', 'season', splits[split]]
+
+    if avg:
+        return splits_averages(game_logs, grouping)
+
+    else:
+        return splits_sum(game_logs, grouping)
+
+
 # helper function to format game log for grouping
 def format_game_log(game_log: pd.DataFrame) -> pd.DataFrame:
-    game_log['home_team'] = game_log['home_team'].replace(True, 'home')
-    game_log['home_team'] = game_log['home_team'].replace(False, 'away')
+    game_log['home_team'] = game_log['home_team'].map({True: 'home', False: 'away'})
     game_log.rename(columns={'home_team': 'game_location'}, inplace=True)
     game_log = game_log.drop(['week', 'day', 'rest_days', 'distance_travelled', 'opp'], axis=1)
     return game_log
 
 
+# helper function that counts the wins, ties and losses of each group in one crosstab
+def records(game_log: pd.DataFrame, grouping: list) -> pd.DataFrame:
+    outcome = game_log['result'].map({'W': 'wins', 'L': 'losses'}).fillna('ties')
+    # arrays rather than Series, so the rows line up by position even if the game log's index repeats labels
+    counts = pd.crosstab([game_log[key].to_numpy() for key in grouping], outcome.to_numpy(), rownames=grouping,
+                         colnames=['outcome'])
+    return counts.reindex(columns=['wins', 'ties', 'losses'], fill_value=0)
+
+
+# helper function to group a game log and aggregate it, with the games (and record, unless grouped by result) of
+# each group first
+def aggregate_splits(game_log: pd.DataFrame, grouping, how: str) -> pd.DataFrame:
+    grouping = [grouping] if isinstance(grouping, str) else list(grouping)
+    groups = game_log.groupby(grouping)
+    aggregated = getattr(groups, how)(numeric_only=True)
+    if 'result' not in grouping:
+        aggregated = records(game_log, grouping).join(aggregated)
+    aggregated.insert(0, 'games', groups.size())
+
+    # list the splits in reverse order (home before away, W before L), within each team-season if grouped by one
+    if len(grouping) > 1:
+        return aggregated.sort_index(ascending=[True] * (len(grouping) - 1) + [False])
+    return aggregated.iloc[::-1]
+
+
 # helper function to group a game log and return its averages
-def splits_averages(game_log: pd.DataFrame, grouping: str) -> pd.DataFrame:
-    # count # of games for each grouping
-    counts = game_log.groupby(grouping).size().to_frame('games')
-
-    # count # of wins and losses for each grouping (if home-road)
-    if grouping == 'game_location':
-        home_wins = 0
-        home_losses = 0
-        home_ties = 0
-        road_wins = 0
-        road_losses = 0
-        road_ties = 0
-        for ind in game_log.index:
-            if game_log['game_location'][ind] == 'home':
-                if game_log['result'][ind] == 'W':
-                    home_wins += 1
-                elif game_log['result'][ind] == 'L':
-                    home_losses += 1
-                else:
-                    home_ties += 1
-            if game_log['game_location'][ind] == 'away':
-                if game_log['result'][ind] == 'W':
-                    road_wins += 1
-                elif game_log['result'][ind] == 'L':
-                    road_losses += 1
-                else:
-                    road_ties += 1
-
-    game_log = game_log.groupby(grouping).mean(numeric_only=True)
-    if grouping == 'game_location':
-        game_log.insert(0, 'wins', [road_wins, home_wins])
-        game_log.insert(1, 'losses', [road_losses, home_losses])
-        game_log.insert(1, 'ties', [road_ties, home_ties])
-    game_log.insert(0, 'games', counts['games'])
-
-    return game_log.iloc[::-1]
+def splits_averages(game_log: pd.DataFrame, grouping) -> pd.DataFrame:
+    return aggregate_splits(game_log, grouping, 'mean')
 
 
 # helper function to group a game log and return its sums
-def splits_sum(game_log: pd.DataFrame, grouping: str) -> pd.DataFrame:
-    # count # of games for each grouping
-    counts = game_log.groupby(grouping).size().to_frame('games')
-
-    # count # of wins and losses for each grouping (if home-road)
-    if grouping == 'game_location':
-        home_wins = 0
-        home_losses = 0
-        home_ties = 0
-        road_wins = 0
-        road_losses = 0
-        road_ties = 0
-        for ind in game_log.index:
-            if game_log['game_location'][ind] == 'home':
-                if game_log['result'][ind] == 'W':
-                    home_wins += 1
-                elif game_log['result'][ind] == 'L':
-                    home_losses += 1
-                else:
-                    home_ties += 1
-            if game_log['game_location'][ind] == 'away':
-                if game_log['result'][ind] == 'W':
-                    road_wins += 1
-                elif game_log['result'][ind] == 'L':
-                    road_losses += 1
-                else:
-                    road_ties += 1
-
-    game_log = game_log.groupby(grouping).sum(numeric_only=True)
-    if grouping == 'game_location':
-        game_log.insert(0, 'wins', [road_wins, home_wins])
-        game_log.insert(1, 'losses', [road_losses, home_losses])
-        game_log.insert(1, 'ties', [road_ties, home_ties])
-    game_log.insert(0, 'games', counts['games'])
-
-    return game_log.iloc[::-1]
+def splits_sum(game_log: pd.DataFrame, grouping) -> pd.DataFrame:
+    return aggregate_splits(game_log, grouping, 'sum')
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the scripts are plain modules in the directory above, imported the way they import each other
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
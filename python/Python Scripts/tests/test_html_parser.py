@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd  # type: ignore
+import pytest
+
+import html_parser
+import parse_pool
+import team_game_log
+from game_log_schema import extract
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+available_backends = [backend for backend in html_parser.backends if html_parser.is_available(backend)]
+
+# saved page, table id, (position, kind) of its game log schema
+game_log_pages = [
+    ('wr_game_log.html', 'stats', ('WR', 'basic')),
+    ('wr_advanced_game_log.html', 'advanced_rushing_and_receiving', ('WR', 'advanced')),
+]
+
+
+# helper function that reads a saved page
+def read_fixture(name: str) -> str:
+    with open(os.path.join(fixtures_dir, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('backend', available_backends)
+@pytest.mark.parametrize('name, table_id', [(name, table_id) for name, table_id, _ in game_log_pages]
+                         + [('team_game_log.html', 'games')])
+def test_table_rows_match_html_parser(name, table_id, backend):
+    html = read_fixture(name)
+    expected = html_parser.table_rows(html, table_id, backend='html.parser')
+    assert expected
+    assert html_parser.table_rows(html, table_id, backend=backend) == expected
+
+
+@pytest.mark.parametrize('backend', available_backends)
+@pytest.mark.parametrize('name, table_id, schema', game_log_pages)
+def test_extract_matches_html_parser(name, table_id, schema, backend):
+    html = read_fixture(name)
+    expected = extract(html_parser.table_rows(html, table_id, backend='html.parser'), *schema)
+    pd.testing.assert_frame_equal(extract(html_parser.table_rows(html, table_id, backend=backend), *schema), expected)
+
+
+@pytest.mark.parametrize('backend', available_backends)
+def test_team_game_log_matches_html_parser(backend):
+    html = read_fixture('team_game_log.html')
+    expected = team_game_log.collect_data(html_parser.table_rows(html, 'games', backend='html.parser'), 2022,
+                                          'Minnesota Vikings')
+    actual = team_game_log.collect_data(html_parser.table_rows(html, 'games', backend=backend), 2022,
+                                        'Minnesota Vikings')
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize('name, table_id, schema', game_log_pages)
+def test_parse_pool_matches_extract(name, table_id, schema):
+    html = read_fixture(name)
+    expected = extract(html_parser.table_rows(html, table_id), *schema)
+    pd.testing.assert_frame_equal(parse_pool.ParsePool(0).parse(html.encode('utf-8'), *schema, table_id), expected)
+
+
+def test_fixtures_keep_inactive_games():
+    html = read_fixture('wr_game_log.html')
+    game_log = extract(html_parser.table_rows(html, 'stats'), 'WR', 'basic')
+    assert len(game_log) == 17
+    assert game_log['inactive'].sum() == 2
+    assert game_log.loc[game_log['inactive'], 'tgt'].isna().all()
+
+
+@pytest.mark.parametrize('backend', available_backends)
+def test_rb_inactive_games_not_started(backend):
+    html = read_fixture('wr_game_log.html')
+    expected = extract(html_parser.table_rows(html, 'stats', backend='html.parser'), 'RB', 'basic')
+    game_log = extract(html_parser.table_rows(html, 'stats', backend=backend), 'RB', 'basic')
+    pd.testing.assert_frame_equal(game_log, expected)
+    inactive = game_log['inactive']
+    assert inactive.sum() == 2
+    assert game_log.loc[inactive, 'started'].notna().all()
+    assert not game_log.loc[inactive, 'started'].any()
+    assert game_log.loc[inactive, 'tgt'].isna().all()
+    assert extract(html_parser.table_rows(html, 'stats'), 'WR', 'basic').loc[inactive, 'started'].isna().all()